@@ -4,26 +4,55 @@ Production-grade fake review classifier using LLM-based approach.
 Designed for Google Colab with OpenAI API.
 """
 
+import argparse
+import asyncio
+import hashlib
 import json
+import os
+import re
 import sys
-from typing import Dict, List, Any
+from collections import Counter
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Any, Literal, Optional, Tuple
 from google.colab import userdata
+import diskcache
+import httpx
+import ijson
+import numpy as np
 import openai
+import orjson
+from pydantic import BaseModel, Field, ValidationError
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_random_exponential
+from tqdm.auto import tqdm
 
 # Configuration
 MODEL_NAME = "gpt-4o-mini"
 TEMPERATURE = 0.1  # Low temperature for deterministic output
-MAX_TOKENS = 300
+MAX_TOKENS = 200  # Per review; a batch request gets MAX_TOKENS * batch size
+MAX_CONCURRENCY = int(os.getenv("CLASSIFIER_CONCURRENCY", "8"))  # In-flight API requests
+BATCH_SIZE = int(os.getenv("CLASSIFIER_BATCH_SIZE", "10"))  # Reviews per chat completion
+QUEUE_DEPTH = BATCH_SIZE * MAX_CONCURRENCY * 2  # Parsed reviews buffered ahead of the workers
+BATCH_POLL_INTERVAL_S = 60  # Status polling interval for --batch (OpenAI Batch API) jobs
+CACHE_DIR = "./.review_cache"
+CACHE_SCHEMA_VERSION = 2  # Bump when the output schema or prompt semantics change
+EMBEDDING_MODEL = "text-embedding-3-small"
+SEMANTIC_CACHE_DIR = os.path.join(CACHE_DIR, "semantic")
+SIMILARITY_THRESHOLD = 0.92  # Cosine similarity required to reuse a near-duplicate's result
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64)
 
-# System prompt for LLM
-SYSTEM_PROMPT = """You are a review authenticity analyzer. Analyze ONLY the linguistic patterns, writing style, and internal consistency of the review text.
+# System prompt for LLM (constant, so it forms a cacheable request prefix)
+SYSTEM_PROMPT = """You are a review authenticity analyzer. You will receive a JSON array of reviews, each with an "id", "text" and "rating". Analyze ONLY the linguistic patterns, writing style, and internal consistency of each review text, judging every review independently.
 
-Output ONLY valid JSON in this exact format:
+Output ONLY valid JSON in this exact format, with exactly one result per input review:
 {
-  "label": "likely_real" or "uncertain" or "likely_fake",
-  "risk_score": <integer 0-100>,
-  "confidence": <float 0.0-1.0>,
-  "reasons": [<string>, <string>, <string>]
+  "results": [
+    {
+      "id": <id of the review>,
+      "label": "likely_real" or "uncertain" or "likely_fake",
+      "risk_score": <integer 0-100>,
+      "confidence": <float 0.0-1.0>,
+      "reasons": [<string>, <string>, <string>]
+    }
+  ]
 }
 
 Classification guidelines:
@@ -34,96 +63,490 @@ Classification guidelines:
 Be conservative. Favor "uncertain" when signals are mixed.
 Output ONLY the JSON object. No explanations, no preamble, no markdown."""
 
+# Fixed start of every user message; only the reviews JSON is appended after it.
+# Neither prompt may be interpolated, or the shared request prefix is lost.
+USER_PROMPT_PREAMBLE = """Analyze each review below and output JSON only.
 
-def load_reviews(filepath: str) -> List[Dict[str, Any]]:
-    """Load reviews from JSON file."""
+Reviews:
+"""
+
+# Persistent exact-match cache of classifications, shared across runs
+review_cache = diskcache.Cache(CACHE_DIR)
+
+
+class SemanticCache:
+    """Near-duplicate cache: unit-normalized review embeddings searched by cosine similarity."""
+
+    def __init__(self, directory: str):
+        self.embeddings_path = os.path.join(directory, "embeddings.npy")
+        self.entries_path = os.path.join(directory, "entries.json")
+        self.embeddings = np.empty((0, 0), dtype=np.float32)
+        self.entries: List[Dict[str, Any]] = []
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            embeddings = np.load(self.embeddings_path)
+            with open(self.entries_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        # Drop the whole index if it was built with different settings
+        if (meta.get("model") != MODEL_NAME
+                or meta.get("embedding_model") != EMBEDDING_MODEL
+                or meta.get("schema_version") != CACHE_SCHEMA_VERSION
+                or len(meta.get("entries", [])) != len(embeddings)):
+            return
+        self.embeddings = embeddings.astype(np.float32, copy=False)
+        self.entries = meta["entries"]
+
+    def lookup(self, embedding: np.ndarray, rating: int) -> Optional[Dict[str, Any]]:
+        """Return the cached result of the most similar review with the same rating."""
+        if not self.entries:
+            return None
+        sims = self.embeddings[:len(self.entries)] @ embedding
+        for idx in np.argsort(sims)[::-1]:
+            if sims[idx] < SIMILARITY_THRESHOLD:
+                break
+            if self.entries[idx]["rating"] == rating:
+                return self.entries[idx]["result"]
+        return None
+
+    def add(self, embedding: np.ndarray, rating: int, result: Dict[str, Any]) -> None:
+        size = len(self.entries)
+        if size == len(self.embeddings):
+            # Rows past len(entries) are spare capacity; doubling keeps inserts amortized O(1)
+            grown = np.empty((max(2 * size, 64), embedding.shape[0]), dtype=np.float32)
+            if size:
+                grown[:size] = self.embeddings
+            self.embeddings = grown
+        self.embeddings[size] = embedding
+        self.entries.append({"rating": rating, "result": result})
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self.embeddings_path), exist_ok=True)
+        np.save(self.embeddings_path, self.embeddings[:len(self.entries)])
+        meta = {
+            "model": MODEL_NAME,
+            "embedding_model": EMBEDDING_MODEL,
+            "schema_version": CACHE_SCHEMA_VERSION,
+            "entries": self.entries
+        }
+        with open(self.entries_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+
+
+semantic_cache = SemanticCache(SEMANTIC_CACHE_DIR)
+
+
+def load_reviews(filepath: str) -> Iterator[Dict[str, Any]]:
+    """Stream reviews from a JSON array or NDJSON (.jsonl/.ndjson) file.
+    
+    Reviews are yielded as they are parsed, so classification can start before
+    the whole file has been read.
+    """
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        return data
+        f = open(filepath, 'rb')
     except FileNotFoundError:
         print(f"Error: File {filepath} not found.")
         sys.exit(1)
-    except json.JSONDecodeError as e:
-        print(f"Error: Invalid JSON format - {e}")
-        sys.exit(1)
+    return _iter_reviews(f, ndjson=filepath.endswith((".jsonl", ".ndjson")))
+
+
+def _iter_reviews(f: BinaryIO, ndjson: bool) -> Iterator[Dict[str, Any]]:
+    with f:
+        if ndjson:
+            for line in f:
+                if line.strip():
+                    yield orjson.loads(line)
+        else:
+            yield from ijson.items(f, "item", use_float=True)
+
+
+def normalize_review_text(review_text: str) -> str:
+    """Strip and collapse whitespace so trivially different copies share a cache entry."""
+    return re.sub(r"\s+", " ", review_text).strip()
+
+
+def _cache_key(review_text: str, rating: int) -> str:
+    """Build a SHA-256 key over everything that determines the LLM output."""
+    payload = {
+        "system_prompt": SYSTEM_PROMPT,
+        "model": MODEL_NAME,
+        "temperature": TEMPERATURE,
+        "schema_version": CACHE_SCHEMA_VERSION,
+        "review_text": normalize_review_text(review_text),
+        "rating": rating
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
 
+def get_cached_classification(key: str) -> Optional[Dict[str, Any]]:
+    """Return a cached classification, ignoring entries from another model or schema."""
+    val = review_cache.get(key)
+    if val is None:
+        return None
+    entry = json.loads(val)
+    if (entry.get("model") != MODEL_NAME
+            or entry.get("temperature") != TEMPERATURE
+            or entry.get("schema_version") != CACHE_SCHEMA_VERSION):
+        return None
+    return entry["result"]
 
-def classify_review(review_text: str, rating: int, api_key: str) -> Dict[str, Any]:
-    """Classify a single review using OpenAI API."""
-    client = openai.OpenAI(api_key=api_key)
+
+def set_cached_classification(key: str, result: Dict[str, Any]) -> None:
+    """Store a classification together with the settings that produced it."""
+    entry = {
+        "model": MODEL_NAME,
+        "temperature": TEMPERATURE,
+        "schema_version": CACHE_SCHEMA_VERSION,
+        "result": result
+    }
+    review_cache.set(key, json.dumps(entry))
+
+
+async def embed_review(review_text: str, client: openai.AsyncOpenAI) -> Optional[np.ndarray]:
+    """Embed the normalized review text; returns None if the embedding call fails."""
+    text = normalize_review_text(review_text)
+    if not text:
+        return None
+    try:
+        response = await client.embeddings.create(model=EMBEDDING_MODEL, input=text)
+    except Exception:
+        return None
+    embedding = np.asarray(response.data[0].embedding, dtype=np.float32)
+    norm = np.linalg.norm(embedding)
+    return embedding / norm if norm else None
+
+
+def fallback_classification(reason: str) -> Dict[str, Any]:
+    """Conservative result used when a review could not be classified."""
+    return {
+        "label": "uncertain",
+        "risk_score": 50,
+        "confidence": 0.0,
+        "reasons": [reason]
+    }
+
+
+class ClassificationResult(BaseModel):
+    """Schema of one classification; extra keys such as the batch "id" are dropped."""
+    label: Literal["likely_real", "uncertain", "likely_fake"]
+    risk_score: int = Field(ge=0, le=100)
+    confidence: float = Field(ge=0, le=1)
+    reasons: List[str]
+
+
+class BatchResponse(BaseModel):
+    """Envelope of a batch reply; items are validated one by one so a bad item only fails itself."""
+    results: List[Dict[str, Any]] = []
+
+
+def describe_validation_error(e: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(map(str, err['loc'])) or 'response'}: {err['msg']}" for err in e.errors())
+
+
+async def lookup_cached_classification(
+    review_text: str, rating: int, client: openai.AsyncOpenAI
+) -> Tuple[str, Optional[np.ndarray], Optional[Dict[str, Any]]]:
+    """Check the exact cache, then the semantic cache. Returns (key, embedding, cached result)."""
+    key = _cache_key(review_text, rating)
+    cached = get_cached_classification(key)
+    if cached is not None:
+        return key, None, cached
     
-    user_prompt = f"""Review Text: {review_text}
-Rating: {rating}/5
+    embedding = await embed_review(review_text, client)
+    if embedding is not None:
+        cached = semantic_cache.lookup(embedding, rating)
+        if cached is not None:
+            set_cached_classification(key, cached)
+    return key, embedding, cached
+
 
-Analyze this review and output JSON only."""
+def completion_params(user_prompt: str, max_tokens: int) -> Dict[str, Any]:
+    """Chat completion request body shared by the streaming and Batch API paths."""
+    return {
+        "model": MODEL_NAME,
+        "messages": [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt}
+        ],
+        "temperature": TEMPERATURE,
+        "max_tokens": max_tokens,
+        "response_format": {"type": "json_object"}
+    }
+
+
+@retry(
+    wait=wait_random_exponential(min=1, max=30),
+    stop=stop_after_attempt(6),
+    retry=retry_if_exception_type((openai.RateLimitError, openai.APIConnectionError, openai.APITimeoutError)),
+    reraise=True
+)
+async def create_completion(user_prompt: str, max_tokens: int, client: openai.AsyncOpenAI) -> str:
+    """Stream a JSON-mode chat completion and return the assembled text.
+    
+    Rate limits, connection errors and timeouts are retried with exponential backoff
+    and jitter; anything else propagates to the caller immediately.
+    """
+    stream = await client.chat.completions.create(**completion_params(user_prompt, max_tokens), stream=True)
     
+    # Assemble the streamed deltas and parse once at the end
+    parts = []
+    async for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            parts.append(chunk.choices[0].delta.content)
+    return "".join(parts).strip()
+
+
+def build_user_prompt(reviews_slice: List[Dict[str, Any]]) -> str:
+    items = [
+        {"id": idx, "text": review["review_text"], "rating": review["rating"]}
+        for idx, review in enumerate(reviews_slice)
+    ]
+    # Static instructions first and the reviews last, so every request shares the
+    # longest possible byte-identical prefix for provider-side prompt caching
+    return USER_PROMPT_PREAMBLE + json.dumps(items, ensure_ascii=False)
+
+
+def parse_batch_reply(reviews_slice: List[Dict[str, Any]], result_text: str) -> List[Dict[str, Any]]:
+    """Map a batch reply back onto its reviews and cache every valid classification."""
     try:
-        response = client.chat.completions.create(
-            model=MODEL_NAME,
-            messages=[
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=TEMPERATURE,
-            max_tokens=MAX_TOKENS
-        )
-        
-        result_text = response.choices[0].message.content.strip()
-        
-        # Parse JSON response
-        result = json.loads(result_text)
-        
-        # Validate required fields
-        required_fields = ["label", "risk_score", "confidence", "reasons"]
-        for field in required_fields:
-            if field not in result:
-                raise ValueError(f"Missing required field: {field}")
-        
-        return result
-        
-    except json.JSONDecodeError:
-        return {
-            "label": "uncertain",
-            "risk_score": 50,
-            "confidence": 0.0,
-            "reasons": ["Error: Failed to parse LLM response"]
+        # Parse and validate the envelope in a single pass
+        by_id = {
+            str(item.get("id")): item
+            for item in BatchResponse.model_validate_json(result_text).results
         }
+    except ValidationError as e:
+        return [fallback_classification(f"Error: Invalid LLM response - {describe_validation_error(e)}") for _ in reviews_slice]
+    
+    results = []
+    for idx, review in enumerate(reviews_slice):
+        item = by_id.get(str(idx))
+        if item is None:
+            results.append(fallback_classification("Error: Review missing from LLM response"))
+            continue
+        try:
+            result = ClassificationResult.model_validate(item).model_dump()
+        except ValidationError as e:
+            results.append(fallback_classification(f"Error: Invalid classification - {describe_validation_error(e)}"))
+            continue
+        
+        # Only successful classifications are cached; error fallbacks are retried next run
+        set_cached_classification(review["key"], result)
+        if review["embedding"] is not None:
+            semantic_cache.add(review["embedding"], review["rating"], result)
+        results.append(result)
+    
+    return results
+
+
+async def classify_batch(reviews_slice: List[Dict[str, Any]], client: openai.AsyncOpenAI) -> List[Dict[str, Any]]:
+    """Classify several reviews with a single chat completion, preserving input order.
+    
+    Each item carries "review_text", "rating", and the "key"/"embedding" from the cache
+    lookup so successful classifications can be stored.
+    """
+    try:
+        result_text = await create_completion(
+            build_user_prompt(reviews_slice), MAX_TOKENS * len(reviews_slice), client
+        )
     except Exception as e:
-        return {
-            "label": "uncertain",
-            "risk_score": 50,
-            "confidence": 0.0,
-            "reasons": [f"Error: {str(e)}"]
-        }
+        return [fallback_classification(f"Error: {str(e)}") for _ in reviews_slice]
+    return parse_batch_reply(reviews_slice, result_text)
 
 
-def process_reviews(reviews: List[Dict[str, Any]], api_key: str) -> List[Dict[str, Any]]:
-    """Process all reviews and return classification results."""
-    results = []
+def group_cache_misses(
+    texts: List[str], ratings: List[int], lookups: List[Tuple[str, Optional[np.ndarray], Optional[Dict[str, Any]]]],
+    classifications: List[Optional[Dict[str, Any]]]
+) -> List[Dict[str, Any]]:
+    """Fill cache hits into `classifications` and group the misses by cache key.
     
-    for idx, review in enumerate(reviews, 1):
-        review_text = review.get("review_text", "")
-        rating = review.get("rating", 3)
+    Duplicate reviews share one entry whose "positions" lists every index it answers.
+    """
+    pending: Dict[str, Dict[str, Any]] = {}
+    for pos, (key, embedding, cached) in enumerate(lookups):
+        if cached is not None:
+            classifications[pos] = cached
+            continue
+        entry = pending.setdefault(key, {
+            "review_text": texts[pos],
+            "rating": ratings[pos],
+            "key": key,
+            "embedding": embedding,
+            "positions": []
+        })
+        entry["positions"].append(pos)
+    return list(pending.values())
+
+
+async def process_reviews(reviews: Iterable[Dict[str, Any]], client: openai.AsyncOpenAI) -> List[Dict[str, Any]]:
+    """Classify a stream of reviews with a pool of concurrent batch workers.
+    
+    A producer feeds parsed reviews into a bounded queue; MAX_CONCURRENCY workers
+    each take up to BATCH_SIZE reviews at a time, answer what they can from the
+    caches and send the rest as one batch request. Results keep the input order.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_DEPTH)
+    results: Dict[int, Dict[str, Any]] = {}
+    # Total is unknown while streaming; tqdm rate-limits its own redraws
+    progress = tqdm(desc="Classifying reviews", unit="review")
+    
+    async def classify_window(window: List[Tuple[int, Dict[str, Any]]]) -> None:
+        texts = [review.get("review_text", "") for _, review in window]
+        ratings = [review.get("rating", 3) for _, review in window]
+        classifications: List[Optional[Dict[str, Any]]] = [None] * len(window)
+        try:
+            lookups = await asyncio.gather(*[
+                lookup_cached_classification(text, rating, client)
+                for text, rating in zip(texts, ratings)
+            ])
+            
+            batch = group_cache_misses(texts, ratings, lookups, classifications)
+            if batch:
+                for entry, classification in zip(batch, await classify_batch(batch, client)):
+                    for pos in entry["positions"]:
+                        classifications[pos] = classification
+        except Exception as e:
+            classifications = [c or fallback_classification(f"Error: {str(e)}") for c in classifications]
         
-        print(f"Processing review {idx}/{len(reviews)}...", end="\r")
+        for (idx, _), text, rating, classification in zip(window, texts, ratings, classifications):
+            results[idx] = {
+                "review_text": text,
+                "rating": rating,
+                "classification": classification
+            }
+        progress.update(len(window))
+    
+    async def produce() -> None:
+        try:
+            for idx, review in enumerate(reviews):
+                await queue.put((idx, review))
+        finally:
+            for _ in range(MAX_CONCURRENCY):
+                await queue.put(None)
+    
+    async def worker() -> None:
+        finished = False
+        while not finished:
+            item = await queue.get()
+            if item is None:
+                return
+            window = [item]
+            while len(window) < BATCH_SIZE:
+                try:
+                    item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if item is None:
+                    finished = True
+                    break
+                window.append(item)
+            await classify_window(window)
+    
+    try:
+        await asyncio.gather(produce(), *[worker() for _ in range(MAX_CONCURRENCY)])
+    finally:
+        progress.close()
+    
+    print(f"Processed {len(results)} reviews successfully.")
+    return [results[idx] for idx in range(len(results))]
+
+
+async def classify_with_batch_api(reviews: Iterable[Dict[str, Any]], client: openai.AsyncOpenAI) -> List[Dict[str, Any]]:
+    """Classify uncached reviews through the OpenAI Batch API (half price, 24h window).
+    
+    Each request line carries BATCH_SIZE reviews in the same format as the online
+    path. Blocks until the batch job finishes, polling every BATCH_POLL_INTERVAL_S.
+    """
+    reviews = list(reviews)
+    texts = [review.get("review_text", "") for review in reviews]
+    ratings = [review.get("rating", 3) for review in reviews]
+    classifications: List[Optional[Dict[str, Any]]] = [None] * len(reviews)
+    
+    semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+    
+    async def sem_lookup(text: str, rating: int):
+        async with semaphore:
+            return await lookup_cached_classification(text, rating, client)
+    
+    lookups = await asyncio.gather(*[sem_lookup(text, rating) for text, rating in zip(texts, ratings)])
+    pending = group_cache_misses(texts, ratings, lookups, classifications)
+    chunks = [pending[i:i + BATCH_SIZE] for i in range(0, len(pending), BATCH_SIZE)]
+    print(f"{len(reviews) - sum(len(e['positions']) for e in pending)} reviews answered from cache, "
+          f"{len(chunks)} batch requests to submit")
+    
+    replies: Dict[str, str] = {}
+    failure = "Error: Batch request failed"
+    if chunks:
+        lines = [
+            orjson.dumps({
+                "custom_id": str(idx),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": completion_params(build_user_prompt(chunk), MAX_TOKENS * len(chunk))
+            })
+            for idx, chunk in enumerate(chunks)
+        ]
+        batch_file = await client.files.create(
+            file=("review_batch.jsonl", b"\n".join(lines)), purpose="batch"
+        )
+        batch = await client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        print(f"Submitted batch {batch.id}")
         
-        classification = classify_review(review_text, rating, api_key)
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            await asyncio.sleep(BATCH_POLL_INTERVAL_S)
+            batch = await client.batches.retrieve(batch.id)
+            print(f"Batch {batch.id}: {batch.status}")
         
-        result = {
-            "review_text": review_text,
+        if batch.output_file_id:
+            output = await client.files.content(batch.output_file_id)
+            for line in output.text.splitlines():
+                if not line.strip():
+                    continue
+                record = orjson.loads(line)
+                response = record.get("response") or {}
+                if response.get("status_code") == 200:
+                    replies[record["custom_id"]] = response["body"]["choices"][0]["message"]["content"]
+        if batch.status != "completed":
+            failure = f"Error: Batch job {batch.status}"
+    
+    for idx, chunk in enumerate(chunks):
+        reply = replies.get(str(idx))
+        chunk_results = (
+            parse_batch_reply(chunk, reply) if reply is not None
+            else [fallback_classification(failure) for _ in chunk]
+        )
+        for entry, classification in zip(chunk, chunk_results):
+            for pos in entry["positions"]:
+                classifications[pos] = classification
+    
+    results = [
+        {
+            "review_text": text,
             "rating": rating,
             "classification": classification
         }
-        
-        results.append(result)
-    
-    print(f"\nProcessed {len(results)} reviews successfully.")
+        for text, rating, classification in zip(texts, ratings, classifications)
+    ]
+    print(f"Processed {len(results)} reviews successfully.")
     return results
 
 
-def main():
+async def main():
     """Main entry point."""
+    parser = argparse.ArgumentParser(description="Classify reviews as likely real or fake.")
+    parser.add_argument(
+        "--batch", action="store_true",
+        help="Use the OpenAI Batch API: half the token price, results within 24h"
+    )
+    # parse_known_args tolerates the extra arguments Colab/Jupyter kernels pass
+    args, _ = parser.parse_known_args()
+    
     # Get API key from Colab secrets
     try:
         api_key = userdata.get('OPENAI_API_KEY')
@@ -132,33 +555,60 @@ def main():
         print("Please add your OpenAI API key to Colab secrets with key name 'OPENAI_API_KEY'")
         sys.exit(1)
     
-    # Load reviews
+    # Stream reviews (JSON array or NDJSON)
     input_file = "sample_reviews.json"
     reviews = load_reviews(input_file)
     
-    print(f"Loaded {len(reviews)} reviews from {input_file}")
+    print(f"Streaming reviews from {input_file}")
     
     # Process reviews
-    results = process_reviews(reviews, api_key)
+    # One client for the whole run so TLS connections are kept alive and multiplexed
+    client = openai.AsyncOpenAI(
+        api_key=api_key,
+        http_client=httpx.AsyncClient(limits=HTTP_LIMITS, http2=True)
+    )
+    try:
+        if args.batch:
+            results = await classify_with_batch_api(reviews, client)
+        else:
+            results = await process_reviews(reviews, client)
+    except (ijson.JSONError, orjson.JSONDecodeError) as e:
+        print(f"Error: Invalid JSON format - {e}")
+        sys.exit(1)
+    finally:
+        await client.close()
+    semantic_cache.save()
     
     # Save results
     output_file = "classification_results.json"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(results, f, indent=2, ensure_ascii=False)
+    with open(output_file, 'wb') as f:
+        f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
     
     print(f"Results saved to {output_file}")
     
     # Print summary statistics
-    label_counts = {"likely_real": 0, "uncertain": 0, "likely_fake": 0}
-    for result in results:
-        label = result["classification"]["label"]
-        label_counts[label] = label_counts.get(label, 0) + 1
+    label_counts = Counter(r["classification"]["label"] for r in results)
+    labels = ["likely_real", "uncertain", "likely_fake"]
+    labels += [label for label in label_counts if label not in labels]
     
     print("\n=== Classification Summary ===")
-    for label, count in label_counts.items():
+    for label in labels:
+        count = label_counts.get(label, 0)
         percentage = (count / len(results)) * 100
         print(f"{label}: {count} ({percentage:.1f}%)")
 
 
 if __name__ == "__main__":
-    main()
+    try:
+        kernel_loop = asyncio.get_running_loop()
+    except RuntimeError:
+        kernel_loop = None
+    if kernel_loop is not None:
+        # Colab/Jupyter cells already run inside the kernel's event loop
+        main_task = kernel_loop.create_task(main())
+    else:
+        if sys.platform != "win32":
+            # libuv-backed event loop: lower per-callback overhead with many requests in flight
+            import uvloop
+            uvloop.install()
+        asyncio.run(main())
@@ -1,28 +1,167 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Dict, Optional
+
+from cachetools import TTLCache
 from fastapi import APIRouter, HTTPException
 import anyio
+import anyio.from_thread
+from selenium.common.exceptions import WebDriverException
 
 from app.schemas.scraper import ScrapeRequest, ScrapeResponse
-from app.services.scraper import scrape_area
+from app.services.scraper import BrowserPool, scrape_area
+
 
+logger = logging.getLogger("gmaps-scraper")
 
 router = APIRouter(tags=["scraper"])
 
+# Each scrape pins a worker thread and a Chrome instance for its whole duration,
+# so cap concurrent scrapes well below AnyIO's default 40-thread pool.
+SCRAPE_LIMITER = anyio.CapacityLimiter(int(os.getenv("SCRAPE_CONCURRENCY", "4")))
+SCRAPE_TIMEOUT_S = float(os.getenv("SCRAPE_TIMEOUT_S", "600"))
+# Place pages within one scrape are extracted concurrently on this many extra drivers
+EXTRACT_WORKERS = int(os.getenv("SCRAPE_EXTRACT_WORKERS", "4"))
+BROWSER_POOL = BrowserPool(
+    size=int(SCRAPE_LIMITER.total_tokens) * (1 + EXTRACT_WORKERS),
+    recycle_after=int(os.getenv("BROWSER_RECYCLE_AFTER", "20")),
+)
+
+# Successful scrape results keyed by the canonicalized request, plus one lock per
+# key currently being scraped.
+_RESPONSE_CACHE: TTLCache = TTLCache(
+    maxsize=int(os.getenv("SCRAPE_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("SCRAPE_CACHE_TTL_S", "600")),
+)
+_INFLIGHT: Dict[str, anyio.Lock] = {}
+
+
+class _ScrapeSlot:
+    """Capacity token owned by whichever side claims it first.
+
+    The worker thread claims it when it starts and releases it when the scrape ends.
+    If the request is cancelled before the thread ever starts, the request claims it
+    and releases it instead, and the late-starting thread then skips the scrape.
+    """
+
+    def __init__(self) -> None:
+        self.borrower = object()
+        self._lock = threading.Lock()
+        self._claimed = False
+
+    def claim(self) -> bool:
+        with self._lock:
+            if self._claimed:
+                return False
+            self._claimed = True
+            return True
+
+
+def _cache_key(payload: ScrapeRequest) -> str:
+    # headless only changes how Chrome runs, not what is scraped
+    canonical = {
+        "input_url": payload.input_url.strip(),
+        "radius_km": payload.radius_km,
+        "keyword": (payload.keyword or "").strip().lower() or None,
+        "desired_results": payload.desired_results,
+    }
+    return hashlib.sha256(json.dumps(canonical, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _scrape_with_token(
+    slot: _ScrapeSlot,
+    input_url: str,
+    radius_km: int,
+    keyword: Optional[str],
+    desired_results: int,
+    headless: bool,
+) -> Optional[Dict]:
+    # The driver and capacity token are released by the worker thread itself, so a
+    # request that times out does not free a slot while its browser is still running.
+    if not slot.claim():
+        return None
+    try:
+        driver = BROWSER_POOL.acquire(headless)
+        try:
+            return scrape_area(
+                input_url,
+                radius_km,
+                keyword,
+                desired_results,
+                headless,
+                driver=driver,
+                pool=BROWSER_POOL,
+                extract_workers=EXTRACT_WORKERS,
+            )
+        finally:
+            BROWSER_POOL.release(driver)
+    finally:
+        anyio.from_thread.run_sync(SCRAPE_LIMITER.release_on_behalf_of, slot.borrower)
+
+
+async def _run_scrape(payload: ScrapeRequest) -> Dict:
+    slot = _ScrapeSlot()
+    try:
+        SCRAPE_LIMITER.acquire_on_behalf_of_nowait(slot.borrower)
+    except anyio.WouldBlock as exc:
+        raise HTTPException(
+            status_code=503, detail="Scraper is at capacity, retry later"
+        ) from exc
+
+    try:
+        with anyio.fail_after(SCRAPE_TIMEOUT_S):
+            return await anyio.to_thread.run_sync(
+                _scrape_with_token,
+                slot,
+                payload.input_url,
+                payload.radius_km,
+                payload.keyword,
+                payload.desired_results,
+                payload.headless,
+                abandon_on_cancel=True,
+            )
+    finally:
+        # Timed out or cancelled while still queued for a worker thread: the thread
+        # has not taken the token, so release it here or it would leak
+        if slot.claim():
+            SCRAPE_LIMITER.release_on_behalf_of(slot.borrower)
+
 
 @router.post("/scrape", response_model=ScrapeResponse)
 async def scrape(payload: ScrapeRequest) -> ScrapeResponse:
+    key = _cache_key(payload)
+    cached = _RESPONSE_CACHE.get(key)
+    if cached is not None:
+        return ScrapeResponse(**cached)
+
+    # Single-flight: concurrent identical requests wait for one scrape and share it
+    lock = _INFLIGHT.setdefault(key, anyio.Lock())
     try:
-        result = await anyio.to_thread.run_sync(
-            scrape_area,
-            payload.input_url,
-            payload.radius_km,
-            payload.keyword,
-            payload.desired_results,
-            payload.headless,
-        )
+        async with lock:
+            result = _RESPONSE_CACHE.get(key)
+            if result is None:
+                result = await _run_scrape(payload)
+                _RESPONSE_CACHE[key] = result
         return ScrapeResponse(**result)
+    except HTTPException:
+        raise
+    except TimeoutError as exc:
+        logger.warning("Scrape timed out after %.0fs payload=%s", SCRAPE_TIMEOUT_S, payload.model_dump())
+        raise HTTPException(status_code=504, detail="Scrape timed out") from exc
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except WebDriverException as exc:
+        logger.exception("Browser error during scrape payload=%s", payload.model_dump())
+        raise HTTPException(status_code=502, detail="Browser error during scrape") from exc
     except RuntimeError as exc:
+        logger.error("Scrape aborted payload=%s: %s", payload.model_dump(), exc)
         raise HTTPException(status_code=500, detail=str(exc)) from exc
-    except Exception:
-        raise HTTPException(status_code=500, detail="Internal server error")
+    except Exception as exc:
+        logger.exception("Scrape failed payload=%s", payload.model_dump())
+        raise HTTPException(status_code=500, detail="Internal server error") from exc
+    finally:
+        if not lock.locked() and lock.statistics().tasks_waiting == 0:
+            _INFLIGHT.pop(key, None)
@@ -1,13 +1,19 @@
 import logging
 import random
 import re
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import datetime, timezone
+from functools import lru_cache
 from math import atan2, cos, radians, sin, sqrt
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 from urllib.parse import parse_qs, quote_plus, urlparse
 
+import numpy as np
 import requests
+from numba import njit
+from requests.adapters import HTTPAdapter
 import json
 from urllib.parse import unquote
 from bs4 import BeautifulSoup
@@ -31,8 +37,43 @@ USER_AGENTS = [
 PHONE_RE = re.compile(r"(\+?\d[\d\-\s\(\)]{6,}\d)")
 PLACE_COORD_RE = re.compile(r"!3d(-?\d+(?:\.\d+)?)!4d(-?\d+(?:\.\d+)?)")
 AT_COORD_RE = re.compile(r"@(-?\d+(?:\.\d+)?),(-?\d+(?:\.\d+)?)")
+COORDS_FALLBACK_RE = re.compile(
+    r'"latitude"\s*[:=]\s*(?P<lat1>[\d.-]+)[^"]{0,200}?"longitude"\s*[:=]\s*(?P<lng1>[\d.-]+)'
+    r'|"lat"\s*[:=]\s*(?P<lat2>[\d.-]+)[^"]{0,200}?"lng"\s*[:=]\s*(?P<lng2>[\d.-]+)'
+    r'|"center"\s*[:=]\s*\[\s*(?P<lat3>[\d.-]+)\s*,\s*(?P<lng3>[\d.-]+)',
+    re.S,
+)
+# Three-letter prefixes cover the full day names too
+DAY_WORDS_RE = re.compile(r"Mon|Tue|Wed|Thu|Fri|Sat|Sun", re.IGNORECASE)
+TIME_RE = re.compile(r"\d{1,2}:\d{2}|am|pm", re.IGNORECASE)
+TEXT_RUN_END_RE = re.compile(r"[<>\n\r]")
+DAY_LINE_MAX_LEN = 120
+HOURS_LABEL_RE = re.compile("Hours", re.IGNORECASE)
+HOURS_SCAN_LIMIT = 50000
+COORDS_MARKERS = ('"latitude"', '"lat"', '"center"')
+RELATIVE_TIME_RE = re.compile(r"\b(today|yesterday|\d+\s+(?:day|days|hour|hours|minute|minutes)\s+ago)\b")
+CAT_RE = re.compile(r"\b\d\.\d\b\s*\(\s*[\d,]+\s*\)\s*([^·•]{2,60})\s*[·•]")
+RATING_LABEL_RE = re.compile(r"(\d+\.?\d*)\s*(?:star|out)")
+RATING_SPAN_RE = re.compile(r"^\d+\.\d+$")
+REVIEW_COUNT_RE = re.compile(r"(\d[\d,]*)\s*review")
+REDIRECT_Q_RE = re.compile(r"/url\?q=([^&]+)")
+PRICE_CURRENCY_RE = re.compile(r"(\u00a3|\$|\u20ac|AED)\s*\d+[\s–\-]*\d*", re.IGNORECASE)
+PRICE_SHORTHAND_RE = re.compile(r"(\${1,4}|\u00a3{1,4}|\u20ac{1,4}|AED\s*\d+|\bAED\b)", re.IGNORECASE)
 ZOOM_LEVELS = {50: 8, 20: 11, 10: 12, 5: 13, 2: 14, 1: 15}
 SHORT_DOMAINS = ("maps.app.goo.gl", "goo.gl", "maps.fi", "goo.gl/maps")
+# Link coordinates can differ slightly from the place page's own, so only links
+# clearly beyond the radius are skipped before extraction.
+URL_RADIUS_MARGIN = 1.1
+# Images, fonts, video, ad trackers and map tiles don't affect the scraped fields;
+# <img> tags (and their src) still appear in the DOM when the download is blocked.
+BLOCKED_URL_PATTERNS = [
+    "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.woff*", "*.mp4",
+    "*googleadservices*", "*doubleclick*", "*/maps/vt*",
+]
+
+# Shared session so repeated short-URL expansions reuse pooled keep-alive connections
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=20, pool_maxsize=20))
 
 
 def radius_to_zoom(radius_km: int) -> int:
@@ -42,7 +83,8 @@ def radius_to_zoom(radius_km: int) -> int:
     return 15
 
 
-def haversine_distance(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+@njit(cache=True, fastmath=True)
+def _haversine_core(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
     r = 6371.0
     lat1_rad, lng1_rad = radians(lat1), radians(lng1)
     lat2_rad, lng2_rad = radians(lat2), radians(lng2)
@@ -52,7 +94,31 @@ def haversine_distance(lat1: float, lng1: float, lat2: float, lng2: float) -> fl
 
     a = sin(dlat / 2) ** 2 + cos(lat1_rad) * cos(lat2_rad) * sin(dlng / 2) ** 2
     c = 2 * atan2(sqrt(a), sqrt(1 - a))
-    return round(r * c, 2)
+    return r * c
+
+
+# Compile (or load from the on-disk cache) at import instead of on the first scrape
+_haversine_core(0.0, 0.0, 0.0, 0.0)
+
+
+def haversine_distance(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    return round(_haversine_core(float(lat1), float(lng1), float(lat2), float(lng2)), 2)
+
+
+def haversine_distance_vec(
+    lat0: float, lng0: float, lats: np.ndarray, lngs: np.ndarray
+) -> np.ndarray:
+    """Distances in km from one center to many points, computed in a single pass."""
+    r = 6371.0
+    lat0_rad, lng0_rad = np.radians(lat0), np.radians(lng0)
+    lats_rad, lngs_rad = np.radians(lats), np.radians(lngs)
+
+    dlat = lats_rad - lat0_rad
+    dlng = lngs_rad - lng0_rad
+
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat0_rad) * np.cos(lats_rad) * np.sin(dlng / 2) ** 2
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    return r * c
 
 
 def parse_coordinates(url: str) -> Tuple[Optional[float], Optional[float]]:
@@ -85,7 +151,8 @@ def safe_sleep(a: float = 0.4, b: float = 1.0) -> None:
 def expand_short_url_requests(url: str, timeout: int = 10) -> Optional[str]:
     try:
         logger.info("Expanding short URL: %s", url)
-        resp = requests.get(url, timeout=timeout, allow_redirects=True)
+        # Only the final URL is needed, so HEAD skips downloading any response body
+        resp = _SESSION.head(url, timeout=timeout, allow_redirects=True)
         logger.info("Expanded to: %s", resp.url)
         return resp.url
     except Exception as exc:
@@ -93,6 +160,13 @@ def expand_short_url_requests(url: str, timeout: int = 10) -> Optional[str]:
         return None
 
 
+@lru_cache(maxsize=1)
+def chromedriver_path() -> str:
+    # ChromeDriverManager().install() checks the driver version over the network on
+    # every call; resolve it once per process.
+    return ChromeDriverManager().install()
+
+
 def init_driver(headless: bool = False) -> webdriver.Chrome:
     options = Options()
     if headless:
@@ -107,7 +181,7 @@ def init_driver(headless: bool = False) -> webdriver.Chrome:
     options.add_argument("window-size=1400,900")
     options.add_argument(f"user-agent={random.choice(USER_AGENTS)}")
 
-    service = Service(ChromeDriverManager().install())
+    service = Service(chromedriver_path())
     driver = webdriver.Chrome(service=service, options=options)
 
     try:
@@ -117,10 +191,100 @@ def init_driver(headless: bool = False) -> webdriver.Chrome:
     except Exception:
         pass
 
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    except Exception as exc:
+        logger.debug("Could not set blocked URLs: %s", exc)
+
     logger.info("Chrome driver initialized")
     return driver
 
 
+class BrowserPool:
+    """Thread-safe pool of warm Chrome drivers, kept separately per headless mode.
+
+    Drivers are recycled after ``recycle_after`` scrapes to bound Chrome's memory
+    growth, and at most ``size`` idle drivers are kept per mode.
+    """
+
+    def __init__(self, size: int, recycle_after: int = 20) -> None:
+        self.size = size
+        self.recycle_after = recycle_after
+        self._idle: Dict[bool, List[webdriver.Chrome]] = {True: [], False: []}
+        self._modes: Dict[int, bool] = {}
+        self._uses: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def _launch(self, headless: bool) -> webdriver.Chrome:
+        driver = init_driver(headless=headless)
+        with self._lock:
+            self._modes[id(driver)] = headless
+            self._uses[id(driver)] = 0
+        return driver
+
+    def _discard(self, driver: webdriver.Chrome) -> None:
+        with self._lock:
+            self._modes.pop(id(driver), None)
+            self._uses.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _reset(driver: webdriver.Chrome) -> None:
+        # Leave a single blank tab with no cookies so the next scrape starts clean
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        driver.delete_all_cookies()
+        driver.get("about:blank")
+
+    def warm(self, count: int, headless: bool = True) -> None:
+        for _ in range(min(count, self.size)):
+            driver = self._launch(headless)
+            with self._lock:
+                self._idle[headless].append(driver)
+        logger.info("Browser pool warmed with %d driver(s)", min(count, self.size))
+
+    def acquire(self, headless: bool = False) -> webdriver.Chrome:
+        with self._lock:
+            if self._idle[headless]:
+                return self._idle[headless].pop()
+        return self._launch(headless)
+
+    def release(self, driver: webdriver.Chrome) -> None:
+        with self._lock:
+            headless = self._modes.get(id(driver))
+            uses = self._uses.get(id(driver), 0) + 1
+            self._uses[id(driver)] = uses
+            keep = (
+                headless is not None
+                and uses < self.recycle_after
+                and len(self._idle[headless]) < self.size
+            )
+        if keep:
+            try:
+                self._reset(driver)
+            except Exception:
+                keep = False
+        if not keep:
+            self._discard(driver)
+            return
+        with self._lock:
+            self._idle[headless].append(driver)
+
+    def close(self) -> None:
+        with self._lock:
+            drivers = self._idle[True] + self._idle[False]
+            self._idle = {True: [], False: []}
+        for driver in drivers:
+            self._discard(driver)
+
+
 def find_results_panel(driver: webdriver.Chrome, timeout: int = 12):
     wait = WebDriverWait(driver, timeout)
     candidates = [
@@ -137,18 +301,92 @@ def find_results_panel(driver: webdriver.Chrome, timeout: int = 12):
     return None
 
 
-def get_current_hrefs(driver: webdriver.Chrome) -> List[str]:
-    hrefs = []
-    for a in driver.find_elements(By.XPATH, "//a[contains(@href,'/maps/place/')]"):
-        href = a.get_attribute("href")
-        if href:
-            hrefs.append(href)
-    return list(dict.fromkeys(hrefs))
+def get_current_hrefs(driver: webdriver.Chrome, seen: Set[str]) -> List[str]:
+    """Return result links not yet in ``seen``, in page order, adding them to it."""
+    # One script call instead of a WebDriver round-trip per link's get_attribute
+    hrefs = driver.execute_script(
+        "return Array.from(document.querySelectorAll(\"a[href*='/maps/place/']\"), a => a.href);"
+    ) or []
+    new_hrefs = []
+    for href in hrefs:
+        if href and href not in seen:
+            seen.add(href)
+            new_hrefs.append(href)
+    return new_hrefs
+
+
+def find_day_lines(text: str, limit: int = 7) -> List[str]:
+    """Return up to ``limit`` distinct text runs that start with a day name and contain a time."""
+    lines: Dict[str, None] = {}
+    last_end = 0
+    for m in DAY_WORDS_RE.finditer(text):
+        start = m.start()
+        if start < last_end:
+            continue
+        end = start + DAY_LINE_MAX_LEN
+        run_end = TEXT_RUN_END_RE.search(text, start, end)
+        if run_end:
+            end = run_end.start()
+        line = text[start:end].strip()
+        if TIME_RE.search(line):
+            lines.setdefault(line)
+            last_end = end
+            if len(lines) >= limit:
+                break
+    return list(lines)
+
+
+def search_near_markers(
+    pattern: re.Pattern, text: str, markers: Tuple[str, ...], window: int
+) -> Optional[re.Match]:
+    """Run ``pattern`` only on the ``window`` chars after each marker's first occurrence.
+
+    str.find locates the candidate region far faster than a regex scan of a
+    multi-megabyte page source.
+    """
+    for marker in markers:
+        idx = text.find(marker)
+        if idx != -1:
+            match = pattern.search(text, idx, idx + window)
+            if match:
+                return match
+    return None
+
+
+def filter_hrefs_by_radius(
+    hrefs: List[str], center_lat: float, center_lng: float, radius_km: float
+) -> Tuple[List[str], List[str]]:
+    """Split hrefs into (candidates, outside) using the coordinates in the URL.
+
+    Hrefs without coordinates are kept as candidates.
+    """
+    coords = [parse_coordinates(h) for h in hrefs]
+    located = [i for i, (lat, lng) in enumerate(coords) if lat is not None and lng is not None]
+    if not located:
+        return hrefs, []
+
+    lats = np.array([coords[i][0] for i in located])
+    lngs = np.array([coords[i][1] for i in located])
+    distances = haversine_distance_vec(center_lat, center_lng, lats, lngs)
+    far = {located[j] for j in np.flatnonzero(distances > radius_km)}
+
+    candidates = [h for i, h in enumerate(hrefs) if i not in far]
+    outside = [h for i, h in enumerate(hrefs) if i in far]
+    return candidates, outside
 
 
 def extract_from_place_url(
-    driver: webdriver.Chrome, href: str, center_lat: float, center_lng: float
+    driver: webdriver.Chrome,
+    href: str,
+    center_lat: float,
+    center_lng: float,
+    new_tab: bool = True,
 ) -> Dict:
+    """Open ``href`` and extract the place's details.
+
+    With ``new_tab`` the place is opened in a new tab that is closed afterwards,
+    leaving the driver on the results list; otherwise the driver itself navigates.
+    """
     result = {
         "business_name": "N/A",
         "address": "N/A",
@@ -177,24 +415,38 @@ def extract_from_place_url(
             center_lat, center_lng, business_lat, business_lng
         )
 
-    original_window = driver.current_window_handle
-    driver.execute_script("window.open(arguments[0], '_blank');", href)
-    safe_sleep(0.6, 1.2)
+    original_window = None
+    if new_tab:
+        original_window = driver.current_window_handle
+        driver.execute_script("window.open(arguments[0], '_blank');", href)
 
-    windows = driver.window_handles
-    new_window = [w for w in windows if w != original_window][-1]
-    driver.switch_to.window(new_window)
+        windows = driver.window_handles
+        new_window = [w for w in windows if w != original_window][-1]
+        driver.switch_to.window(new_window)
+    else:
+        driver.get(href)
 
     try:
-        WebDriverWait(driver, 12).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-        safe_sleep(1.0, 2.0)
+        # Wait for the place content itself rather than sleeping a fixed interval
+        try:
+            WebDriverWait(driver, 8).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, "h1, div[role='main']"))
+            )
+        except TimeoutException:
+            logger.debug("Place content not rendered after 8s: %s", href)
 
-        page_text = driver.page_source.lower()
-        if "unusual traffic" in page_text or "are you a robot" in page_text:
+        # Serializing the DOM is a full WebDriver round-trip; read it once and reuse it
+        page_source = driver.page_source
+        page_head = page_source[:50000].lower()
+        if "unusual traffic" in page_head or "are you a robot" in page_head:
             logger.error("Captcha detected")
             raise RuntimeError("Captcha detected")
 
-        soup = BeautifulSoup(driver.page_source, "html.parser")
+        # lxml parses UTF-8 bytes natively; declaring the encoding skips bs4's detection pass.
+        # The str form is kept for the regex fallbacks.
+        soup = BeautifulSoup(page_source.encode("utf-8", errors="ignore"), "lxml", from_encoding="utf-8")
+        # Whole-document text, computed once for all the text-based fallbacks below
+        full_text = soup.get_text(" ", strip=True)
 
         # Try to extract coordinates, opening hours, company url and price from JSON-LD first
         try:
@@ -276,62 +528,28 @@ def extract_from_place_url(
 
         # Extra fallback: try to extract coords from page JSON blobs if still missing
         if not result["latitude"] or not result["longitude"]:
-            page_text = driver.page_source
-            # look for patterns like "latitude":25.123 or "lat":25.123
-            m = re.search(r'"latitude"\s*[:=]\s*([\d\.-]+)', page_text)
-            n = re.search(r'"longitude"\s*[:=]\s*([\d\.-]+)', page_text)
-            if m and n:
+            # one pass for "latitude"/"longitude", "lat"/"lng" or "center":[lat,lng]
+            m = search_near_markers(COORDS_FALLBACK_RE, page_source, COORDS_MARKERS, 400)
+            if m:
+                lat_s = m.group("lat1") or m.group("lat2") or m.group("lat3")
+                lng_s = m.group("lng1") or m.group("lng2") or m.group("lng3")
                 try:
-                    lat_j = float(m.group(1))
-                    lng_j = float(n.group(1))
+                    lat_j = float(lat_s)
+                    lng_j = float(lng_s)
                     result["latitude"] = lat_j
                     result["longitude"] = lng_j
                     result["distance_km"] = haversine_distance(center_lat, center_lng, lat_j, lng_j)
                 except Exception:
                     pass
-            else:
-                # try "lat":25.12, "lng":55.12 or "center":[25.12,55.12]
-                m2 = re.search(r'"lat"\s*[:=]\s*([\d\.-]+).*?"lng"\s*[:=]\s*([\d\.-]+)', page_text, re.S)
-                if m2:
-                    try:
-                        lat_j = float(m2.group(1))
-                        lng_j = float(m2.group(2))
-                        result["latitude"] = lat_j
-                        result["longitude"] = lng_j
-                        result["distance_km"] = haversine_distance(center_lat, center_lng, lat_j, lng_j)
-                    except Exception:
-                        pass
-                else:
-                    m3 = re.search(r'"center"\s*[:=]\s*\[\s*([\d\.-]+)\s*,\s*([\d\.-]+)\s*\]', page_text)
-                    if m3:
-                        try:
-                            lat_j = float(m3.group(1))
-                            lng_j = float(m3.group(2))
-                            result["latitude"] = lat_j
-                            result["longitude"] = lng_j
-                            result["distance_km"] = haversine_distance(center_lat, center_lng, lat_j, lng_j)
-                        except Exception:
-                            pass
 
         # Fallback extraction for opening hours from page text if still empty
         if not result["opening_hours"]:
-            page_text = driver.page_source
-            day_pattern = r"(Mon|Monday|Tue|Tuesday|Wed|Wednesday|Thu|Thursday|Fri|Friday|Sat|Saturday|Sun|Sunday)\w*[^<>\n\r]{0,100}"
-            matches = re.findall(day_pattern, page_text, flags=re.IGNORECASE)
-            if matches:
-                # find lines containing day names and nearby times
-                lines = []
-                for m in re.finditer(r"([A-Za-z]{3,9}[^<>\n\r]{0,80})", page_text):
-                    t = m.group(1).strip()
-                    if re.search(r"Mon|Tue|Wed|Thu|Fri|Sat|Sun|Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday", t, re.IGNORECASE) and re.search(r"\d{1,2}:\d{2}|am|pm", t, re.IGNORECASE):
-                        lines.append(t)
-                if lines:
-                    # dedupe and limit
-                    seen = []
-                    for l in lines:
-                        if l not in seen:
-                            seen.append(l)
-                    result["opening_hours"] = seen[:7]
+            # Scan only the hours widget when present rather than the whole page source
+            hours_el = soup.find(attrs={"aria-label": HOURS_LABEL_RE})
+            hours_html = str(hours_el)[:HOURS_SCAN_LIMIT] if hours_el else page_source
+            lines = find_day_lines(hours_html)
+            if lines:
+                result["opening_hours"] = lines
 
         h1 = soup.select_one("h1")
         if h1 and h1.get_text(strip=True):
@@ -361,18 +579,11 @@ def extract_from_place_url(
             cat = soup.select_one(selector)
             if cat and cat.get_text(strip=True):
                 cat_text = cat.get_text(strip=True)
-                if not re.search(
-                    r"\b(today|yesterday|\d+\s+(?:day|days|hour|hours|minute|minutes)\s+ago)\b",
-                    cat_text.lower(),
-                ):
+                if not RELATIVE_TIME_RE.search(cat_text.lower()):
                     result["category"] = cat_text
                     break
         if result["category"] == "N/A":
-            text_flat = soup.get_text(" ", strip=True)
-            cat_match = re.search(
-                r"\b\d\.\d\b\s*\(\s*[\d,]+\s*\)\s*([^·•]{2,60})\s*[·•]",
-                text_flat,
-            )
+            cat_match = CAT_RE.search(full_text)
             if cat_match:
                 cat_text = cat_match.group(1).strip()
                 if (
@@ -382,39 +593,36 @@ def extract_from_place_url(
                 ):
                     result["category"] = cat_text
 
+        # Targeted selectors first; the broad scans only run when they come up empty
         rating_found = False
-        for div in soup.find_all("div", {"aria-label": True}):
-            aria_label = div.get("aria-label", "").lower()
-            if "star" in aria_label or "rating" in aria_label:
-                rating_match = re.search(r"(\d+\.?\d*)\s*(?:star|out)", aria_label)
-                if rating_match:
-                    result["rating"] = rating_match.group(1)
-                    rating_found = True
-                    break
+        for div in soup.select("div[aria-label*='star' i], div[aria-label*='rating' i]"):
+            rating_match = RATING_LABEL_RE.search(div.get("aria-label", "").lower())
+            if rating_match:
+                result["rating"] = rating_match.group(1)
+                rating_found = True
+                break
 
         if not rating_found:
             rating_span = soup.find(
-                "span", {"aria-hidden": "true"}, string=re.compile(r"^\d+\.\d+$")
+                "span", {"aria-hidden": "true"}, string=RATING_SPAN_RE
             )
             if rating_span:
                 result["rating"] = rating_span.get_text(strip=True)
                 rating_found = True
 
         reviews_found = False
-        for button in soup.find_all("button"):
-            btn_text = button.get_text(" ", strip=True)
-            if "review" in btn_text.lower():
-                review_match = re.search(r"(\d[\d,]*)\s*review", btn_text.lower())
-                if review_match:
-                    result["reviews_count"] = review_match.group(1).replace(",", "")
-                    reviews_found = True
-                    break
+        for elem in soup.select("[aria-label*='review' i]"):
+            review_match = REVIEW_COUNT_RE.search(elem.get("aria-label", "").lower())
+            if review_match:
+                result["reviews_count"] = review_match.group(1).replace(",", "")
+                reviews_found = True
+                break
 
         if not reviews_found:
-            for elem in soup.find_all(attrs={"aria-label": True}):
-                aria = elem.get("aria-label", "")
-                if "review" in aria.lower():
-                    review_match = re.search(r"(\d[\d,]*)\s*review", aria.lower())
+            for button in soup.select("button"):
+                btn_text = button.get_text(" ", strip=True).lower()
+                if "review" in btn_text:
+                    review_match = REVIEW_COUNT_RE.search(btn_text)
                     if review_match:
                         result["reviews_count"] = review_match.group(1).replace(",", "")
                         break
@@ -427,7 +635,7 @@ def extract_from_place_url(
                 target = parse_qs(parsed.query).get("q", [None])[0]
                 if not target:
                     # try to extract q= from the path
-                    m = re.search(r"/url\?q=([^&]+)", href_a)
+                    m = REDIRECT_Q_RE.search(href_a)
                     if m:
                         target = unquote(m.group(1))
                 if target:
@@ -467,8 +675,7 @@ def extract_from_place_url(
             if match:
                 ph = match.group(1)
         if not ph:
-            text_all = soup.get_text(" ")
-            match = PHONE_RE.search(text_all)
+            match = PHONE_RE.search(full_text)
             if match:
                 ph = match.group(1)
         if ph:
@@ -493,14 +700,13 @@ def extract_from_place_url(
         if hours:
             result["opening_hours"] = hours
 
-        txt_all = soup.get_text(" ")
         # Try currency symbols and explicit ranges first
-        price_m = re.search(r"(\u00a3|\$|\u20ac|AED)\s*\d+[\s–\-]*\d*", txt_all, re.IGNORECASE)
+        price_m = PRICE_CURRENCY_RE.search(full_text)
         if price_m:
             result["price_level"] = price_m.group(0)
         else:
             # common shorthand like $, $$, AED ranges or words
-            match2 = re.search(r"(\${1,4}|\u00a3{1,4}|\u20ac{1,4}|AED\s*\d+|\bAED\b)", txt_all, re.IGNORECASE)
+            match2 = PRICE_SHORTHAND_RE.search(full_text)
             if match2:
                 result["price_level"] = match2.group(0)
 
@@ -518,34 +724,38 @@ def extract_from_place_url(
                 images.append(src)
         result["images"] = images[:10]
 
-        desc_candidate = soup.select_one("div[data-section-id='overview'], div[data-item-id='description']")
-        if desc_candidate and desc_candidate.get_text(strip=True):
-            result["description"] = desc_candidate.get_text(" ", strip=True)
+        desc_candidate = soup.select_one(
+            "div[data-section-id='overview'], div[data-item-id='description'], "
+            "div.PYvSYb, div[jsinstance] div.fontBodyMedium"
+        )
+        desc_text = desc_candidate.get_text(" ", strip=True) if desc_candidate else ""
+        if desc_text:
+            result["description"] = desc_text
         else:
-            long_texts = [
-                p.get_text(" ", strip=True)
-                for p in soup.select("div")
-                if p.get_text(strip=True) and 40 < len(p.get_text(strip=True)) < 600
-            ]
-            if long_texts:
-                result["description"] = long_texts[0]
+            # Broad scan only when none of the known description containers exist
+            for p in soup.select("div"):
+                txt = p.get_text(" ", strip=True)
+                if 40 < len(txt) < 600:
+                    result["description"] = txt
+                    break
 
-        result["raw_page_text_snippet"] = soup.get_text(" ", strip=True)[:800]
+        result["raw_page_text_snippet"] = full_text[:800]
 
     except Exception as exc:
         logger.warning("Error extracting %s: %s", href, exc)
     finally:
-        try:
-            driver.close()
-        except Exception:
-            pass
-        try:
-            driver.switch_to.window(original_window)
-        except Exception:
+        if original_window is not None:
             try:
-                driver.switch_to.window(driver.window_handles[0])
+                driver.close()
             except Exception:
                 pass
+            try:
+                driver.switch_to.window(original_window)
+            except Exception:
+                try:
+                    driver.switch_to.window(driver.window_handles[0])
+                except Exception:
+                    pass
 
     return result
 
@@ -556,7 +766,17 @@ def scrape_area(
     keyword: Optional[str] = None,
     desired_results: int = 10,
     headless: bool = False,
+    driver: Optional[webdriver.Chrome] = None,
+    pool: Optional[BrowserPool] = None,
+    extract_workers: int = 1,
 ) -> Dict:
+    """Scrape businesses around ``input_url``.
+
+    When ``driver`` is given (e.g. checked out of a ``BrowserPool``) it is used as-is
+    and left open for the caller; otherwise a fresh driver is started and quit.
+    With a ``pool`` and ``extract_workers`` > 1, place pages are extracted
+    concurrently on drivers borrowed from the pool for the duration of the scrape.
+    """
     input_url = input_url.strip()
     full_url = input_url
 
@@ -569,7 +789,12 @@ def scrape_area(
 
     lat, lng = parse_coordinates(full_url)
 
-    driver = init_driver(headless=headless)
+    owns_driver = driver is None
+    if owns_driver:
+        driver = init_driver(headless=headless)
+    executor: Optional[ThreadPoolExecutor] = None
+    worker_drivers: List[webdriver.Chrome] = []
+    worker_drivers_lock = threading.Lock()
     try:
         if lat is None or lng is None:
             logger.info("Resolving URL via browser...")
@@ -605,15 +830,65 @@ def scrape_area(
 
         within_radius = []
         outside_radius = []
-        processed_hrefs = set()
+        seen_hrefs: Set[str] = set()
+        total_processed = 0
+        skipped_outside_radius = 0
+
+        def log_processing(href: str) -> None:
+            logger.info(
+                "Processing: %s [Need %d more results]",
+                href[:80],
+                desired_results - len(within_radius),
+            )
+
+        def record(info: Dict) -> None:
+            if info.get("distance_km") is not None:
+                if info["distance_km"] <= radius_km:
+                    within_radius.append(info)
+                    logger.info(
+                        "[INCLUDED #%d] %s - %.2f km",
+                        len(within_radius),
+                        info["business_name"],
+                        info["distance_km"],
+                    )
+                else:
+                    outside_radius.append(info)
+                    logger.info(
+                        "[EXCLUDED] %s - %.2f km (outside radius)",
+                        info["business_name"],
+                        info["distance_km"],
+                    )
+            else:
+                within_radius.append(info)
+                logger.warning(
+                    "[INCLUDED #%d] %s - distance unknown",
+                    len(within_radius),
+                    info["business_name"],
+                )
+
+        # Place pages load in parallel on pooled drivers, one per worker thread; the
+        # results page stays open on ``driver``. Results are recorded on this thread.
+        if pool is not None and extract_workers > 1:
+            executor = ThreadPoolExecutor(max_workers=extract_workers, thread_name_prefix="extract")
+        worker_local = threading.local()
+
+        def extract_in_worker(href: str) -> Dict:
+            worker_driver = getattr(worker_local, "driver", None)
+            if worker_driver is None:
+                worker_driver = pool.acquire(headless)
+                worker_local.driver = worker_driver
+                with worker_drivers_lock:
+                    worker_drivers.append(worker_driver)
+            info = extract_from_place_url(worker_driver, href, lat, lng, new_tab=False)
+            safe_sleep(0.8, 1.8)
+            return info
 
         max_scroll_attempts = 100
         scroll_attempts = 0
         no_new_results_count = 0
 
         while len(within_radius) < desired_results and scroll_attempts < max_scroll_attempts:
-            current_hrefs = get_current_hrefs(driver)
-            new_hrefs = [h for h in current_hrefs if h not in processed_hrefs]
+            new_hrefs = get_current_hrefs(driver, seen_hrefs)
 
             if not new_hrefs:
                 if panel:
@@ -636,53 +911,60 @@ def scrape_area(
 
             no_new_results_count = 0
 
-            for href in new_hrefs:
-                if len(within_radius) >= desired_results:
-                    break
+            # Drop places whose URL already puts them outside the radius before opening a tab
+            new_hrefs, outside_hrefs = filter_hrefs_by_radius(
+                new_hrefs, lat, lng, radius_km * URL_RADIUS_MARGIN
+            )
+            if outside_hrefs:
+                total_processed += len(outside_hrefs)
+                skipped_outside_radius += len(outside_hrefs)
+                logger.info("[SKIPPED] %d link(s) outside radius by URL coordinates", len(outside_hrefs))
+
+            if executor is None:
+                for href in new_hrefs:
+                    if len(within_radius) >= desired_results:
+                        break
 
-                processed_hrefs.add(href)
-                logger.info(
-                    "Processing: %s [Need %d more results]",
-                    href[:80],
-                    desired_results - len(within_radius),
-                )
+                    total_processed += 1
+                    log_processing(href)
 
-                try:
-                    info = extract_from_place_url(driver, href, lat, lng)
-
-                    if info.get("distance_km") is not None:
-                        if info["distance_km"] <= radius_km:
-                            within_radius.append(info)
-                            logger.info(
-                                "[INCLUDED #%d] %s - %.2f km",
-                                len(within_radius),
-                                info["business_name"],
-                                info["distance_km"],
-                            )
-                        else:
-                            outside_radius.append(info)
-                            logger.info(
-                                "[EXCLUDED] %s - %.2f km (outside radius)",
-                                info["business_name"],
-                                info["distance_km"],
-                            )
-                    else:
-                        within_radius.append(info)
-                        logger.warning(
-                            "[INCLUDED #%d] %s - distance unknown",
-                            len(within_radius),
-                            info["business_name"],
-                        )
-
-                    safe_sleep(0.8, 1.8)
-
-                except RuntimeError as exc:
-                    logger.error("Aborting due to: %s", exc)
+                    try:
+                        record(extract_from_place_url(driver, href, lat, lng))
+                        safe_sleep(0.8, 1.8)
+
+                    except RuntimeError as exc:
+                        logger.error("Aborting due to: %s", exc)
+                        break
+                    except Exception as exc:
+                        logger.warning("Failed to extract %s: %s", href, exc)
+                        safe_sleep(0.5, 1.0)
+                        continue
+                continue
+
+            # Keep at most one place per worker in flight, and never more than are
+            # still needed, so the pool doesn't overshoot desired_results.
+            pending_hrefs = iter(new_hrefs)
+            in_flight: Dict[Future, str] = {}
+            while True:
+                while (
+                    len(in_flight) < extract_workers
+                    and len(within_radius) + len(in_flight) < desired_results
+                ):
+                    href = next(pending_hrefs, None)
+                    if href is None:
+                        break
+                    total_processed += 1
+                    log_processing(href)
+                    in_flight[executor.submit(extract_in_worker, href)] = href
+                if not in_flight:
                     break
-                except Exception as exc:
-                    logger.warning("Failed to extract %s: %s", href, exc)
-                    safe_sleep(0.5, 1.0)
-                    continue
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    href = in_flight.pop(future)
+                    try:
+                        record(future.result())
+                    except Exception as exc:
+                        logger.warning("Failed to extract %s: %s", href, exc)
 
         within_radius.sort(
             key=lambda x: x.get("distance_km") if x.get("distance_km") is not None else 999
@@ -697,9 +979,9 @@ def scrape_area(
             "zoom_level": zoom,
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "desired_results": desired_results,
-            "total_processed": len(processed_hrefs),
+            "total_processed": total_processed,
             "within_radius": len(within_radius),
-            "excluded_outside_radius": len(outside_radius),
+            "excluded_outside_radius": len(outside_radius) + skipped_outside_radius,
             "data": within_radius,
             "excluded_data": outside_radius,
         }
@@ -708,14 +990,19 @@ def scrape_area(
         logger.info("SUMMARY:")
         logger.info("  Desired results: %d", desired_results)
         logger.info("  Results within %d km: %d", radius_km, len(within_radius))
-        logger.info("  Total links processed: %d", len(processed_hrefs))
-        logger.info("  Excluded (outside radius): %d", len(outside_radius))
+        logger.info("  Total links processed: %d", total_processed)
+        logger.info("  Excluded (outside radius): %d", len(outside_radius) + skipped_outside_radius)
         logger.info("=" * 70)
 
         return output
 
     finally:
-        try:
-            driver.quit()
-        except Exception:
-            pass
+        if executor is not None:
+            executor.shutdown(wait=True)
+        for worker_driver in worker_drivers:
+            pool.release(worker_driver)
+        if owns_driver:
+            try:
+                driver.quit()
+            except Exception:
+                pass
@@ -1,8 +1,28 @@
 import logging
+import queue
 import sys
+import threading
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener
+from typing import Optional
+
+
+LOG_BUFFER_CAPACITY = 512
+LOG_FLUSH_INTERVAL_S = 30.0
+
+_listener: Optional[QueueListener] = None
+_file_buffer: Optional[MemoryHandler] = None
+_stop_flusher = threading.Event()
+
+
+def _flush_periodically() -> None:
+    while not _stop_flusher.wait(LOG_FLUSH_INTERVAL_S):
+        if _file_buffer is not None:
+            _file_buffer.flush()
 
 
 def configure_logging() -> None:
+    global _listener, _file_buffer
+
     if sys.platform == "win32":
         try:
             sys.stdout.reconfigure(encoding="utf-8")
@@ -18,9 +38,37 @@ def configure_logging() -> None:
 
     file_handler = logging.FileHandler("scraper.log", encoding="utf-8")
     file_handler.setFormatter(formatter)
+    # Batch file writes; flushed when full, on ERROR, every LOG_FLUSH_INTERVAL_S and on shutdown
+    _file_buffer = MemoryHandler(
+        capacity=LOG_BUFFER_CAPACITY,
+        flushLevel=logging.ERROR,
+        target=file_handler,
+        flushOnClose=True,
+    )
 
     stream_handler = logging.StreamHandler()
     stream_handler.setFormatter(formatter)
 
-    logger.addHandler(file_handler)
-    logger.addHandler(stream_handler)
+    # Scraper threads only enqueue records; file and console I/O happen on the listener thread
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    logger.addHandler(QueueHandler(log_queue))
+    _listener = QueueListener(log_queue, _file_buffer, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+    _stop_flusher.clear()
+    threading.Thread(target=_flush_periodically, name="log-flusher", daemon=True).start()
+
+
+def shutdown_logging() -> None:
+    global _listener, _file_buffer
+
+    _stop_flusher.set()
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    if _file_buffer is not None:
+        target = _file_buffer.target
+        _file_buffer.close()
+        if target is not None:
+            target.close()
+        _file_buffer = None
@@ -1,21 +1,49 @@
+import os
+from contextlib import asynccontextmanager
+
+import anyio
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from starlette.middleware.cors import CORSMiddleware
+from starlette.middleware.gzip import GZipMiddleware
+
+from app.routers.scraper import BROWSER_POOL, SCRAPE_LIMITER, router as scraper_router
+from app.schemas.scraper import ScrapeRequest
+from app.utils.logging import configure_logging, shutdown_logging
 
-from app.routers.scraper import router as scraper_router
-from app.utils.logging import configure_logging
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Pre-launch browsers so the first requests skip Chrome's cold start; warm the
+    # mode requests use by default, since the pool keeps drivers per headless mode
+    prewarm = int(os.getenv("BROWSER_POOL_PREWARM", str(int(SCRAPE_LIMITER.total_tokens))))
+    default_headless = ScrapeRequest.model_fields["headless"].default
+    prewarm_headless = os.getenv("BROWSER_POOL_PREWARM_HEADLESS", str(default_headless)).lower() in ("1", "true", "yes")
+    if prewarm > 0:
+        await anyio.to_thread.run_sync(BROWSER_POOL.warm, prewarm, prewarm_headless)
+    yield
+    await anyio.to_thread.run_sync(BROWSER_POOL.close)
+    shutdown_logging()
 
 
 def create_app() -> FastAPI:
     configure_logging()
-    app = FastAPI(title="Google Maps Radius Scraper", version="1.0.0")
-    # Enable CORS for browser-based requests (adjust origins for production)
+    app = FastAPI(
+        title="Google Maps Radius Scraper",
+        version="1.0.0",
+        lifespan=lifespan,
+        default_response_class=ORJSONResponse,
+    )
+    # Enable CORS for browser-based requests (set CORS_ALLOW_ORIGINS for production)
     app.add_middleware(
         CORSMiddleware,
-        allow_origins=["*"],
+        allow_origins=os.getenv("CORS_ALLOW_ORIGINS", "*").split(","),
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    # Scrape results are large, repetitive JSON; added last so it wraps CORS
+    app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
 
     app.include_router(scraper_router, prefix="/api")
     return app
@@ -1,106 +1,57 @@
 import time
-import json
 import re
 import os
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from concurrent.futures import ThreadPoolExecutor
+import orjson
 from fastapi import FastAPI, HTTPException
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 
 
 # ========== CONFIG ==========
 maps_url = "https://maps.app.goo.gl/WxhAxP3hhBcnf6wcA"
-chromedriver_path = r"E:\Downloads\chromedriver-win64\chromedriver-win64\chromedriver.exe"
+chromedriver_path = os.getenv("CHROMEDRIVER_PATH", r"E:\Downloads\chromedriver-win64\chromedriver-win64\chromedriver.exe")
 REVIEWS_TO_SCRAPE = 100
+DRIVER_POOL_SIZE = int(os.getenv("DRIVER_POOL_SIZE", "2"))
 
 logger = logging.getLogger("app")
-logging.basicConfig(level=logging.INFO)
-
-app = FastAPI()
-
-
-def extract_all_reviews(driver):
-    """Extract reviews without date - only rating, reviewer, text"""
-
-    reviews = driver.execute_script(r"""
-        function extractReviews() {
-            const allReviews = [];
-            const wrappers = document.querySelectorAll('div.jftiEf');
-
-            wrappers.forEach((wrapper) => {
-                const review = {
-                    review_id: '',
-                    reviewer: '',
-                    rating: null,
-                    review_text: ''
-                };
-
-                // Review ID
-                try {
-                    const idEl = wrapper.querySelector('[data-review-id]');
-                    if (idEl) review.review_id = idEl.getAttribute('data-review-id');
-                } catch(e) {}
-
-                // Reviewer Name
-                try {
-                    const nameEl = wrapper.querySelector('.d4r55');
-                    if (nameEl) review.reviewer = nameEl.textContent.trim();
-                } catch(e) {}
-
-                // Review Text
-                try {
-                    const textEl = wrapper.querySelector('.wiI7pd');
-                    if (textEl) review.review_text = textEl.textContent.trim();
-                } catch(e) {}
-
-                // === EXTRACT RATING ===
-                try {
-                    const allText = wrapper.textContent;
-                    const ratingMatch = allText.match(/(\d+(?:\.\d+)?)\s*\/\s*5/);
-                    if (ratingMatch) {
-                        review.rating = parseFloat(ratingMatch[1]);
-                    }
-                } catch(e) {}
-
-                // Fallback: Search spans for X/5 pattern
-                if (review.rating === null) {
-                    try {
-                        const allSpans = wrapper.querySelectorAll('span');
-                        for (let span of allSpans) {
-                            const text = span.textContent.trim();
-                            const match = text.match(/^(\d+(?:\.\d+)?)\s*\/\s*5/);
-                            if (match) {
-                                review.rating = parseFloat(match[1]);
-                                break;
-                            }
-                        }
-                    } catch(e) {}
-                }
 
-                allReviews.push(review);
-            });
 
-            return allReviews;
-        }
+def configure_logging():
+    # Handlers run on the listener's thread; request threads only enqueue records
+    formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+    file_handler = logging.FileHandler("scraper.log", encoding="utf-8")
+    file_handler.setFormatter(formatter)
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(formatter)
 
-        return extractReviews();
-    """)
+    log_queue = queue.Queue(-1)
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.addHandler(QueueHandler(log_queue))
+    return QueueListener(log_queue, file_handler, stream_handler, respect_handler_level=True)
 
-    return reviews
 
+log_listener = configure_logging()
+log_listener.start()
 
-def clean_phone(phone):
-    if not phone:
-        return ""
-    phone = phone.replace("", "").strip()
-    return re.sub(r"[^0-9+]", "", phone)
+app = FastAPI(default_response_class=ORJSONResponse)
+
+# Output files are written in the background so responses don't wait on disk I/O
+output_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="output-writer")
+# The reviews list compresses well; small responses are sent as-is
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
 
 
-def scrape_reviews(maps_url=maps_url, chromedriver_path=chromedriver_path, REVIEWS_TO_SCRAPE=REVIEWS_TO_SCRAPE):
+def create_driver(chromedriver_path=chromedriver_path):
     # ========== SELENIUM SETUP (HEADLESS MODE) ==========
     chrome_options = Options()
     chrome_options.add_argument("--headless")  # Run in background
@@ -111,13 +62,244 @@ def scrape_reviews(maps_url=maps_url, chromedriver_path=chromedriver_path, REVIE
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--disable-dev-shm-usage")
     chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36")
+    # Only review text is scraped, so skip map tiles/avatars and background traffic
+    chrome_options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.default_content_setting_values.notifications": 2,
+    })
+    chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--disable-plugins")
+    chrome_options.add_argument("--disable-background-networking")
 
     service = Service(chromedriver_path)
-    driver = webdriver.Chrome(service=service, options=chrome_options)
-    wait = WebDriverWait(driver, 20)
+    # Reuse one HTTP connection to chromedriver for all the scroll/poll commands
+    return webdriver.Chrome(service=service, options=chrome_options, keep_alive=True)
+
+
+class DriverPool:
+    """Warm headless Chrome sessions shared across requests.
+
+    Drivers are created at startup; when all are busy (or none could be launched
+    at startup) a driver is launched on demand and kept on release if there is room.
+    """
+
+    def __init__(self, size, chromedriver_path=chromedriver_path):
+        self.size = size
+        self.chromedriver_path = chromedriver_path
+        self._idle = queue.Queue(maxsize=size)
+        self._closed = False
+
+    def start(self):
+        # A bad driver path must not stop the app: requests can still pass their own
+        # chromedriver_path, and acquire() retries the launch on demand
+        for _ in range(self.size):
+            try:
+                self._idle.put(create_driver(self.chromedriver_path))
+            except Exception:
+                logger.exception("Could not launch Chrome from %s; drivers will be created on demand", self.chromedriver_path)
+                break
+        logger.info("Driver pool started with %d Chrome session(s)", self._idle.qsize())
+
+    def acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return create_driver(self.chromedriver_path)
+
+    def release(self, driver):
+        if not self._closed:
+            try:
+                # Keep the browser warm but start the next scrape from a clean state
+                driver.delete_all_cookies()
+                driver.get("about:blank")
+                self._idle.put_nowait(driver)
+                return
+            except Exception:
+                pass
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
 
+driver_pool = DriverPool(DRIVER_POOL_SIZE)
+
+
+@app.on_event("startup")
+def start_driver_pool():
+    driver_pool.start()
+
+
+@app.on_event("shutdown")
+def close_driver_pool():
+    driver_pool.close()
+    output_writer.shutdown(wait=True)
+    log_listener.stop()
+
+
+# Args: CSS selector, timeout in ms; resolves with the first matching element or null
+WAIT_FOR_SELECTOR_JS = r"""
+    const [selector, timeoutMs] = arguments;
+    const done = arguments[arguments.length - 1];
+    const found = document.querySelector(selector);
+    if (found) {
+        done(found);
+        return;
+    }
+    const observer = new MutationObserver(() => {
+        const el = document.querySelector(selector);
+        if (el) {
+            observer.disconnect();
+            clearTimeout(timer);
+            done(el);
+        }
+    });
+    const timer = setTimeout(() => {
+        observer.disconnect();
+        done(null);
+    }, timeoutMs);
+    observer.observe(document.documentElement, {childList: true, subtree: true});
+"""
+
+# Args: scroll box, target count, stale-tick limit, max ticks. Each tick scrolls, then
+# extracts only review cards not seen before; resolves with every review collected.
+SCROLL_AND_EXTRACT_JS = r"""
+    const [box, target, staleLimit, maxTicks] = arguments;
+    const done = arguments[arguments.length - 1];
+
+    function extractReview(wrapper) {
+        const review = {
+            review_id: '',
+            reviewer: '',
+            rating: null,
+            review_text: ''
+        };
+
+        // Review ID
+        try {
+            const idEl = wrapper.querySelector('[data-review-id]');
+            if (idEl) review.review_id = idEl.getAttribute('data-review-id');
+        } catch(e) {}
+
+        // Reviewer Name
+        try {
+            const nameEl = wrapper.querySelector('.d4r55');
+            if (nameEl) review.reviewer = nameEl.textContent.trim();
+        } catch(e) {}
+
+        // Review Text
+        try {
+            const textEl = wrapper.querySelector('.wiI7pd');
+            if (textEl) review.review_text = textEl.textContent.trim();
+        } catch(e) {}
+
+        // === EXTRACT RATING ===
+        // Star widget carries the rating in its aria-label, e.g. "4 stars"
+        try {
+            const starsEl = wrapper.querySelector('span[role="img"][aria-label*="star"]');
+            if (starsEl) {
+                const m = starsEl.getAttribute('aria-label').match(/([\d.]+)/);
+                if (m) review.rating = parseFloat(m[1]);
+            }
+        } catch(e) {}
+
+        // Fallback: "X/5" anywhere in the review text
+        if (review.rating === null) {
+            try {
+                const ratingMatch = wrapper.textContent.match(/(\d+(?:\.\d+)?)\s*\/\s*5/);
+                if (ratingMatch) {
+                    review.rating = parseFloat(ratingMatch[1]);
+                }
+            } catch(e) {}
+        }
+
+        return review;
+    }
+
+    const seen = new Set();
+    const collected = [];
+
+    function collectNew() {
+        let added = 0;
+        document.querySelectorAll('div.jftiEf').forEach((wrapper) => {
+            const idEl = wrapper.querySelector('[data-review-id]');
+            const key = (idEl && idEl.getAttribute('data-review-id')) || wrapper;
+            if (seen.has(key)) return;
+            seen.add(key);
+            collected.push(extractReview(wrapper));
+            added += 1;
+        });
+        return added;
+    }
+
+    let stale = 0, ticks = 0;
+    const timer = setInterval(() => {
+        box.scrollTop = box.scrollHeight;
+        stale = collectNew() ? 0 : stale + 1;
+        ticks += 1;
+        if (collected.length >= target || stale >= staleLimit || ticks >= maxTicks) {
+            clearInterval(timer);
+            done(collected);
+        }
+    }, 1200);
+"""
+
+
+def wait_for_selector(driver, selector, timeout=20):
+    """Wait in the page (MutationObserver) for ``selector``; returns the element or None."""
+    driver.set_script_timeout(timeout + 5)
+    return driver.execute_async_script(WAIT_FOR_SELECTOR_JS, selector, timeout * 1000)
+
+
+def scroll_and_extract_reviews(driver, scroll_box, REVIEWS_TO_SCRAPE=REVIEWS_TO_SCRAPE):
+    """Load and extract reviews (rating, reviewer, text - no date) in one script call.
+
+    Cards are extracted as they load, while the page waits for the next batch,
+    instead of walking every card again once scrolling is done.
+    """
+    driver.set_script_timeout(120)
+    return driver.execute_async_script(SCROLL_AND_EXTRACT_JS, scroll_box, REVIEWS_TO_SCRAPE, 5, 80)
+
+
+PHONE_RE = re.compile(r"[^0-9+]")
+FILENAME_RE = re.compile(r'[^A-Za-z0-9 ]+')
+
+
+def write_output(path, data):
     try:
-        print("🌍 Opening Google Maps (headless mode)...")
+        with open(path, "wb") as f:
+            f.write(data)
+    except OSError:
+        logger.exception("Failed to write %s", path)
+
+
+def clean_phone(phone):
+    if not phone:
+        return ""
+    return PHONE_RE.sub("", phone.strip())
+
+
+def scrape_reviews(maps_url=maps_url, chromedriver_path=chromedriver_path, REVIEWS_TO_SCRAPE=REVIEWS_TO_SCRAPE, driver=None):
+    # A pooled driver is left open for the caller; otherwise start one for this run
+    owns_driver = driver is None
+    if owns_driver:
+        driver = create_driver(chromedriver_path)
+
+    try:
+        logger.info("🌍 Opening Google Maps (headless mode)...")
         driver.get(maps_url)
         time.sleep(5)
 
@@ -128,9 +310,9 @@ def scrape_reviews(maps_url=maps_url, chromedriver_path=chromedriver_path, REVIE
         except:
             pass
 
-        print("🏢 Extracting business details...")
+        logger.info("🏢 Extracting business details...")
         try:
-            name_el = wait.until(EC.visibility_of_element_located((By.XPATH, '//h1[contains(@class,"DUwDvf")]')))
+            name_el = wait_for_selector(driver, "h1.DUwDvf")
             company_name = name_el.text.strip()
         except:
             company_name = "Unknown"
@@ -145,48 +327,27 @@ def scrape_reviews(maps_url=maps_url, chromedriver_path=chromedriver_path, REVIE
                 continue
         phone_number = clean_phone(phone_number)
 
-        print(f"✔ Company: {company_name}")
-        print(f"✔ Phone: {phone_number}")
+        logger.info("✔ Company: %s", company_name)
+        logger.info("✔ Phone: %s", phone_number)
 
-        print("🟦 Opening reviews section...")
+        logger.info("🟦 Opening reviews section...")
         try:
-            review_tab = wait.until(EC.element_to_be_clickable((By.XPATH, '//button[contains(@aria-label,"reviews")]')))
+            review_tab = wait_for_selector(driver, 'button[aria-label*="reviews"]')
+            if review_tab is None:
+                raise TimeoutException("reviews button not found")
             driver.execute_script("arguments[0].click();", review_tab)
             time.sleep(4)
         except Exception as e:
-            print("⚠ Could not open reviews:", e)
-
-        print("🔁 Scrolling to load reviews...")
-        scroll_box = wait.until(EC.presence_of_element_located((By.XPATH, '//div[contains(@class,"m6QErb") and contains(@class,"DxyBCb")]')))
+            logger.warning("⚠ Could not open reviews: %s", e)
 
-        previous_count = 0
-        stale_count = 0
-        scroll_attempts = 0
+        logger.info("🔁 Scrolling to load reviews...")
+        scroll_box = wait_for_selector(driver, "div.m6QErb.DxyBCb")
+        if scroll_box is None:
+            raise TimeoutException("reviews panel not found")
 
-        while scroll_attempts < 80:
-            driver.execute_script("arguments[0].scrollTop = arguments[0].scrollHeight", scroll_box)
-            time.sleep(1.2)
+        reviews_data = scroll_and_extract_reviews(driver, scroll_box, REVIEWS_TO_SCRAPE)
 
-            current_count = len(driver.find_elements(By.XPATH, '//div[contains(@class,"jftiEf")]'))
-            print(f"   Loaded: {current_count} reviews...", end='\r')
-
-            if current_count >= REVIEWS_TO_SCRAPE:
-                break
-
-            if current_count == previous_count:
-                stale_count += 1
-                if stale_count >= 5:
-                    break
-            else:
-                stale_count = 0
-
-            previous_count = current_count
-            scroll_attempts += 1
-
-        print(f"\n✔ Total reviews loaded: {current_count}")
-
-        print("📝 Extracting reviews...")
-        reviews_data = extract_all_reviews(driver)
+        logger.info("✔ Total reviews loaded: %d", len(reviews_data))
         reviews_data = reviews_data[:REVIEWS_TO_SCRAPE]
 
         for review in reviews_data:
@@ -196,7 +357,7 @@ def scrape_reviews(maps_url=maps_url, chromedriver_path=chromedriver_path, REVIE
                 review['rating'] = "No rating"
 
         os.makedirs("output", exist_ok=True)
-        file_name = re.sub(r'[^A-Za-z0-9 ]+', '', company_name).replace(" ", "_") + "_reviews.json"
+        file_name = FILENAME_RE.sub('', company_name).replace(" ", "_") + "_reviews.json"
         path = os.path.join("output", file_name)
 
         result = {
@@ -206,41 +367,55 @@ def scrape_reviews(maps_url=maps_url, chromedriver_path=chromedriver_path, REVIE
             "reviews": reviews_data
         }
 
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(result, f, indent=4, ensure_ascii=False)
+        # Compact UTF-8 JSON, serialized in one pass; only the write is deferred
+        output_writer.submit(write_output, path, orjson.dumps(result))
 
         ratings_found = sum(1 for r in reviews_data if r['rating'] != 'No rating')
 
-        print(f"\n🎉 DONE! Saved to: {path}")
-        print(f"\n📊 Statistics:")
-        print(f"   Total Reviews: {len(reviews_data)}")
-        print(f"   ✓ Ratings Found: {ratings_found}/{len(reviews_data)} ({ratings_found/len(reviews_data)*100:.1f}%)")
-        print(f"   ✓ Reviews with Text: {sum(1 for r in reviews_data if r['review_text'])}")
-
-        if reviews_data:
-            print(f"\n📝 Sample Reviews:")
-            for i in range(min(3, len(reviews_data))):
-                print(f"\n   [{i+1}] {reviews_data[i]['reviewer']}")
-                print(f"       Rating: {reviews_data[i]['rating']}")
-                print(f"       Text: {reviews_data[i]['review_text'][:80]}...")
+        logger.info("🎉 DONE! Saving to: %s", path)
+        logger.info(
+            "📊 Statistics: total reviews=%d, ratings found=%d/%d (%.1f%%), reviews with text=%d",
+            len(reviews_data),
+            ratings_found,
+            len(reviews_data),
+            ratings_found / max(len(reviews_data), 1) * 100,
+            sum(1 for r in reviews_data if r['review_text']),
+        )
+
+        for i in range(min(3, len(reviews_data))):
+            logger.info(
+                "📝 Sample review [%d] %s | Rating: %s | Text: %s...",
+                i + 1,
+                reviews_data[i]['reviewer'],
+                reviews_data[i]['rating'],
+                reviews_data[i]['review_text'][:80],
+            )
 
         return result
 
     except Exception as e:
-        print("❌ ERROR:", e)
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ ERROR: %s", e)
         raise
 
     finally:
-        driver.quit()
+        if owns_driver:
+            driver.quit()
 
 
 @app.get("/")
 @app.post("/")
 def scrape_endpoint(maps_url: str = maps_url, chromedriver_path: str = chromedriver_path, REVIEWS_TO_SCRAPE: int = REVIEWS_TO_SCRAPE):
+    driver = None
     try:
-        return scrape_reviews(maps_url=maps_url, chromedriver_path=chromedriver_path, REVIEWS_TO_SCRAPE=REVIEWS_TO_SCRAPE)
+        # Pooled drivers are built from the default chromedriver_path
+        if chromedriver_path == driver_pool.chromedriver_path:
+            driver = driver_pool.acquire()
+        result = scrape_reviews(maps_url=maps_url, chromedriver_path=chromedriver_path, REVIEWS_TO_SCRAPE=REVIEWS_TO_SCRAPE, driver=driver)
+        # Returned as a response directly so FastAPI skips jsonable_encoder over every review
+        return ORJSONResponse(result)
     except Exception as e:
         logger.exception("Unhandled error")
         raise HTTPException(status_code=500, detail=f"❌ ERROR: {e}")
+    finally:
+        if driver is not None:
+            driver_pool.release(driver)
@@ -11,37 +11,66 @@
 # ============================================================================
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional, Dict
+from typing import AsyncIterator, List, Optional, Dict
 import os
+import sys
 import json
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import openai
+import redis.asyncio as redis
+import tiktoken
+from async_lru import alru_cache
 from dotenv import load_dotenv
 import PyPDF2
 from docx import Document
 import pandas as pd
+import openpyxl
 import chromadb
 from chromadb.config import Settings
+from chromadb.utils.embedding_functions import OpenAIEmbeddingFunction
 
 load_dotenv()
 
 # Configuration
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-CHUNK_SIZE = 1000
+CHUNK_TOKENS = 800
+CHUNK_OVERLAP = 100
 TOP_K = 3
+EMBEDDING_MODEL = "text-embedding-3-small"
+EMBEDDING_DIM = 1536
+EMBED_BATCH_SIZE = 100
+EMBED_CONCURRENCY = 8
+QUERY_CACHE_SIZE = 2048
+HISTORY_MESSAGES = 6  # Last 3 turns
+SESSION_TTL_S = 3600
 DATA_DIR = "./data"
+SUPPORTED_EXTENSIONS = ['.txt', '.md', '.json', '.pdf', '.docx', '.csv', '.xlsx', '.xls']
 CHROMA_DIR = "./chroma_db"
 
 openai.api_key = OPENAI_API_KEY
-client = openai.OpenAI(api_key=OPENAI_API_KEY)
+client = openai.AsyncOpenAI(api_key=OPENAI_API_KEY)
 
 # Initialize ChromaDB
 chroma_client = chromadb.PersistentClient(path=CHROMA_DIR)
 collection = None
+# Bound to the collection so Chroma embeds with the same model as ingestion instead of its local default
+embedding_function = OpenAIEmbeddingFunction(api_key=OPENAI_API_KEY, model_name=EMBEDDING_MODEL)
+
+encoding = tiktoken.encoding_for_model(EMBEDDING_MODEL)
 
 # Global Storage
-conversations = {}
+# Conversation history lives in Redis so it is shared across workers and expires per session
+redis_client = redis.Redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0"), decode_responses=True)
+# Retrieval results per (query, k); only valid until the next rebuild
+query_results = {}
+# Incremented when a rebuild starts and again when it ends, so an odd value means the
+# collection is half-built and results must not be cached
+index_generation = 0
 
 # Strong System Prompt to Control Hallucination
 SYSTEM_PROMPT = """You are a precise and accurate AI assistant. Follow these rules strictly:
@@ -62,9 +91,28 @@ class ChatRequest(BaseModel):
     message: str
     session_id: Optional[str] = "default"
 
-class ChatResponse(BaseModel):
-    response: str
-    sources: Optional[List[str]] = None
+class GZipExceptPaths:
+    """GZipMiddleware for every route except the given paths.
+
+    Starlette < 0.39 (pinned via fastapi 0.115) buffers streamed bodies inside zlib,
+    which would hold back SSE tokens until the end of the stream.
+    """
+
+    def __init__(self, app, excluded_paths, **gzip_options):
+        self.app = app
+        self.gzip = GZipMiddleware(app, **gzip_options)
+        self.excluded_paths = set(excluded_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+        else:
+            await self.gzip(scope, receive, send)
+
+def sse_event(data, event: Optional[str] = None) -> str:
+    # JSON-encode the payload so newlines in model output can't break SSE framing
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
 
 # File Parsers
 def parse_file(file_path: Path) -> str:
@@ -82,7 +130,19 @@ def parse_file(file_path: Path) -> str:
         elif ext == '.csv':
             df = pd.read_csv(file_path)
             return df.to_string(index=False)
-        elif ext in ['.xlsx', '.xls']:
+        elif ext == '.xlsx':
+            # Stream rows instead of materializing every sheet as a DataFrame
+            wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+            try:
+                parts = []
+                for ws in wb.worksheets:
+                    parts.append(f"Sheet: {ws.title}")
+                    for row in ws.iter_rows(values_only=True):
+                        parts.append("\t".join("" if v is None else str(v) for v in row))
+                return "\n".join(parts)
+            finally:
+                wb.close()
+        elif ext == '.xls':
             df = pd.read_excel(file_path, sheet_name=None)
             result = []
             for sheet_name, sheet_df in df.items():
@@ -94,21 +154,39 @@ def parse_file(file_path: Path) -> str:
 
 # Chunking
 def chunk_text(text: str, source: str) -> List[Dict]:
-    words = text.split()
+    # Sliding window over tokens so neighbouring chunks share CHUNK_OVERLAP tokens
+    tokens = encoding.encode(text, disallowed_special=())
     chunks = []
-    for i in range(0, len(words), CHUNK_SIZE):
-        chunk = " ".join(words[i:i + CHUNK_SIZE])
+    for i in range(0, max(len(tokens) - CHUNK_OVERLAP, 1), CHUNK_TOKENS - CHUNK_OVERLAP):
+        chunk = encoding.decode(tokens[i:i + CHUNK_TOKENS])
         if chunk.strip():
             chunks.append({"content": chunk, "source": source})
     return chunks
 
 # Embeddings
-def get_embeddings(texts: List[str]) -> List[List[float]]:
-    response = client.embeddings.create(model="text-embedding-3-small", input=texts)
+async def get_embeddings(texts: List[str]) -> List[List[float]]:
+    response = await client.embeddings.create(model=EMBEDDING_MODEL, input=texts)
     return [item.embedding for item in response.data]
 
+@alru_cache(maxsize=QUERY_CACHE_SIZE)
+async def embed_query(text: str) -> tuple:
+    # Tuple so cached vectors can't be mutated by callers
+    return tuple((await get_embeddings([text]))[0])
+
 # ChromaDB Functions
-def build_vector_store():
+async def build_vector_store():
+    global index_generation
+    
+    index_generation += 1
+    query_results.clear()
+    try:
+        await rebuild_collection()
+    finally:
+        # Drop anything cached from the old collection after the rebuild started
+        index_generation += 1
+        query_results.clear()
+
+async def rebuild_collection():
     global collection
     
     # Delete existing collection if exists
@@ -120,14 +198,23 @@ def build_vector_store():
     # Create new collection
     collection = chroma_client.create_collection(
         name="documents",
-        metadata={"hnsw:space": "cosine"}
+        embedding_function=embedding_function,
+        metadata={
+            "hnsw:space": "cosine",
+            "hnsw:construction_ef": 200,
+            "hnsw:M": 32,
+            "hnsw:search_ef": 64,
+        }
     )
     
-    # Load documents
+    # Load documents; parsing PDFs/spreadsheets is CPU-bound, so spread files across processes
+    file_paths = [p for p in Path(DATA_DIR).rglob('*') if p.suffix.lower() in SUPPORTED_EXTENSIONS]
     all_chunks = []
-    for file_path in Path(DATA_DIR).rglob('*'):
-        if file_path.suffix.lower() in ['.txt', '.md', '.json', '.pdf', '.docx', '.csv', '.xlsx', '.xls']:
-            content = parse_file(file_path)
+    if file_paths:
+        with ProcessPoolExecutor(max_workers=min(len(file_paths), os.cpu_count() or 1)) as executor:
+            loop = asyncio.get_running_loop()
+            contents = await asyncio.gather(*(loop.run_in_executor(executor, parse_file, p) for p in file_paths))
+        for file_path, content in zip(file_paths, contents):
             if content:
                 all_chunks.extend(chunk_text(content, str(file_path)))
     
@@ -140,22 +227,25 @@ def build_vector_store():
     sources = [chunk["source"] for chunk in all_chunks]
     ids = [f"doc_{i}" for i in range(len(texts))]
     
-    # Add in batches (ChromaDB has batch size limits)
-    batch_size = 100
-    for i in range(0, len(texts), batch_size):
-        batch_texts = texts[i:i + batch_size]
-        batch_sources = sources[i:i + batch_size]
-        batch_ids = ids[i:i + batch_size]
-        
-        # Get embeddings for batch
-        batch_embeddings = get_embeddings(batch_texts)
-        
-        # Add to collection
-        collection.add(
-            documents=batch_texts,
+    # Embed batches concurrently, capped at EMBED_CONCURRENCY in-flight requests
+    semaphore = asyncio.Semaphore(EMBED_CONCURRENCY)
+    
+    async def embed(batch_texts: List[str]) -> List[List[float]]:
+        async with semaphore:
+            return await get_embeddings(batch_texts)
+    
+    starts = range(0, len(texts), EMBED_BATCH_SIZE)
+    all_embeddings = await asyncio.gather(*(embed(texts[i:i + EMBED_BATCH_SIZE]) for i in starts))
+    
+    # Add in batches (ChromaDB has batch size limits); Chroma is synchronous, so
+    # writes run in a worker thread to keep the event loop serving requests
+    for i, batch_embeddings in zip(starts, all_embeddings):
+        await asyncio.to_thread(
+            collection.add,
+            documents=texts[i:i + EMBED_BATCH_SIZE],
             embeddings=batch_embeddings,
-            metadatas=[{"source": src} for src in batch_sources],
-            ids=batch_ids
+            metadatas=[{"source": src} for src in sources[i:i + EMBED_BATCH_SIZE]],
+            ids=ids[i:i + EMBED_BATCH_SIZE]
         )
     
     print(f"✅ Indexed {len(all_chunks)} chunks from {len(list(Path(DATA_DIR).rglob('*')))} files")
@@ -163,22 +253,35 @@ def build_vector_store():
 def load_vector_store():
     global collection
     try:
-        collection = chroma_client.get_collection("documents")
+        collection = chroma_client.get_collection("documents", embedding_function=embedding_function)
         doc_count = collection.count()
-        print(f"✅ Loaded ChromaDB collection with {doc_count} documents")
-        return doc_count > 0
-    except:
+    except Exception:
         print("⚠️  No existing vector store found")
         return False
+    print(f"✅ Loaded ChromaDB collection with {doc_count} documents")
+    if doc_count > 0:
+        # Throwaway query so the HNSW index is loaded before the first real chat;
+        # a failure here must not make startup rebuild (and re-embed) the whole index
+        try:
+            collection.query(query_embeddings=[[1.0] + [0.0] * (EMBEDDING_DIM - 1)], n_results=1)
+        except Exception as e:
+            print(f"Error warming up vector store: {e}")
+    return doc_count > 0
 
-def search_similar(query: str, k: int = TOP_K) -> List[Dict]:
+async def search_similar(query: str, k: int = TOP_K) -> List[Dict]:
     if not collection:
         return []
     
+    cached = query_results.get((query, k))
+    if cached is not None:
+        return cached
+    
+    generation = index_generation
     try:
-        query_emb = get_embeddings([query])[0]
+        query_emb = list(await embed_query(query))
         
-        results = collection.query(
+        results = await asyncio.to_thread(
+            collection.query,
             query_embeddings=[query_emb],
             n_results=k
         )
@@ -191,30 +294,33 @@ def search_similar(query: str, k: int = TOP_K) -> List[Dict]:
                     "source": metadata.get("source", "unknown")
                 })
         
+        # Only cache results computed entirely against a finished collection
+        if generation == index_generation and generation % 2 == 0:
+            if len(query_results) >= QUERY_CACHE_SIZE:
+                query_results.pop(next(iter(query_results)))
+            query_results[(query, k)] = similar_docs
         return similar_docs
     except Exception as e:
         print(f"Error searching: {e}")
         return []
 
 # Chat Function with Strong Anti-Hallucination Measures
-def chat_with_rag(message: str, session_id: str) -> Dict:
+# Yields SSE events: "data" events carry {"content": delta}, then one "sources" event
+async def chat_with_rag(message: str, session_id: str) -> AsyncIterator[str]:
     # Retrieve context
-    similar_docs = search_similar(message)
+    similar_docs = await search_similar(message)
     
     if not similar_docs:
-        return {
-            "response": "I don't have any relevant information in my document database to answer your question. Please ensure documents are ingested first.",
-            "sources": []
-        }
+        yield sse_event({"content": "I don't have any relevant information in my document database to answer your question. Please ensure documents are ingested first."})
+        yield sse_event([], event="sources")
+        return
     
     context = "\n\n---\n\n".join([f"Source: {doc['source']}\nContent: {doc['content']}" for doc in similar_docs])
     sources = list(set([doc["source"] for doc in similar_docs]))
     
     # Build conversation history
-    if session_id not in conversations:
-        conversations[session_id] = []
-    
-    history = conversations[session_id][-6:]  # Last 3 turns
+    session_key = f"sess:{session_id}"
+    history = [json.loads(item) for item in await redis_client.lrange(session_key, -HISTORY_MESSAGES, -1)]
     
     # Create messages with strong anti-hallucination prompt
     messages = [
@@ -224,31 +330,46 @@ def chat_with_rag(message: str, session_id: str) -> Dict:
         {"role": "user", "content": message}
     ]
     
-    # Get response
-    response = client.chat.completions.create(
+    # Stream response tokens to the client as they arrive
+    stream = await client.chat.completions.create(
         model="gpt-4o-mini",  # Using gpt-4o-mini as requested
         messages=messages,
         temperature=0.1,  # Lower temperature for more factual responses
-        max_tokens=800
+        max_tokens=800,
+        stream=True
     )
     
-    assistant_msg = response.choices[0].message.content
+    parts = []
+    async for chunk in stream:
+        delta = chunk.choices[0].delta.content if chunk.choices else None
+        if delta:
+            parts.append(delta)
+            yield sse_event({"content": delta})
+    assistant_msg = "".join(parts)
     
     # Update history (without system messages)
-    conversations[session_id].append({"role": "user", "content": message})
-    conversations[session_id].append({"role": "assistant", "content": assistant_msg})
+    async with redis_client.pipeline(transaction=False) as pipe:
+        pipe.rpush(
+            session_key,
+            json.dumps({"role": "user", "content": message}),
+            json.dumps({"role": "assistant", "content": assistant_msg}),
+        )
+        pipe.ltrim(session_key, -HISTORY_MESSAGES, -1)
+        pipe.expire(session_key, SESSION_TTL_S)
+        await pipe.execute()
     
-    return {"response": assistant_msg, "sources": sources}
+    yield sse_event(sources, event="sources")
 
 # FastAPI App
 app = FastAPI(title="RAG Chatbot", version="2.0")
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=os.getenv("CORS_ALLOW_ORIGINS", "*").split(","),
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(GZipExceptPaths, excluded_paths={"/chat"}, minimum_size=1024, compresslevel=5)
 
 @app.on_event("startup")
 async def startup():
@@ -256,11 +377,15 @@ async def startup():
     if not load_vector_store():
         print("📚 Building vector store from data/ directory...")
         if Path(DATA_DIR).exists():
-            build_vector_store()
+            await build_vector_store()
         else:
             print(f"⚠️  Creating {DATA_DIR} directory - please add your documents there")
             Path(DATA_DIR).mkdir(exist_ok=True)
 
+@app.on_event("shutdown")
+async def shutdown():
+    await redis_client.aclose()
+
 @app.get("/")
 async def root():
     doc_count = collection.count() if collection else 0
@@ -269,7 +394,7 @@ async def root():
         "model": "gpt-4o-mini",
         "vector_db": "ChromaDB",
         "documents_indexed": doc_count,
-        "supported_formats": [".txt", ".md", ".json", ".pdf", ".docx", ".csv", ".xlsx", ".xls"],
+        "supported_formats": SUPPORTED_EXTENSIONS,
         "endpoints": {
             "chat": "POST /chat",
             "ingest": "POST /ingest",
@@ -282,7 +407,7 @@ async def root():
 async def ingest():
     """Rebuild vector store from data/ directory"""
     try:
-        build_vector_store()
+        await build_vector_store()
         doc_count = collection.count() if collection else 0
         return {
             "status": "success",
@@ -292,22 +417,24 @@ async def ingest():
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/chat", response_model=ChatResponse)
+@app.post("/chat")
 async def chat(request: ChatRequest):
-    """Chat with RAG - answers ONLY from your documents"""
-    try:
-        if not collection or collection.count() == 0:
-            raise HTTPException(
-                status_code=400,
-                detail="No documents indexed. Please add documents to data/ folder and call POST /ingest"
-            )
-        
-        result = chat_with_rag(request.message, request.session_id)
-        return ChatResponse(**result)
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    """Chat with RAG - answers ONLY from your documents, streamed as server-sent events"""
+    if not collection or collection.count() == 0:
+        raise HTTPException(
+            status_code=400,
+            detail="No documents indexed. Please add documents to data/ folder and call POST /ingest"
+        )
+    
+    async def events() -> AsyncIterator[str]:
+        # Headers are already sent once streaming starts, so failures become an "error" event
+        try:
+            async for event in chat_with_rag(request.message, request.session_id):
+                yield event
+        except Exception as e:
+            yield sse_event({"detail": str(e)}, event="error")
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
 
 @app.get("/health")
 async def health():
@@ -323,10 +450,17 @@ async def health():
 @app.delete("/session/{session_id}")
 async def clear_session(session_id: str):
     """Clear conversation history for a session"""
-    if session_id in conversations:
-        del conversations[session_id]
+    await redis_client.delete(f"sess:{session_id}")
     return {"status": "cleared", "session_id": session_id}
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # uvloop/httptools ship with uvicorn[standard]; uvloop has no Windows build
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+    )
\ No newline at end of file
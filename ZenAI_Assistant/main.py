@@ -2,13 +2,12 @@ import os
 import json
 
 import streamlit as st
-from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_chroma import Chroma
 from langchain_openai import ChatOpenAI
-from langchain.memory import ConversationBufferMemory
+from langchain.memory import ConversationSummaryBufferMemory
 from langchain.chains import ConversationalRetrievalChain
 
-from vectorize_documents import embeddings
+from vectorize_documents import build_embeddings
 
 working_dir = os.path.dirname(os.path.abspath(__file__))
 config_data = json.load(open(f"{working_dir}/config.json"))
@@ -16,11 +15,17 @@ OPENAI_API_KEY = config_data["OPENAI_API_KEY"]
 os.environ["OPENAI_API_KEY"] = OPENAI_API_KEY
 
 
+@st.cache_resource
+def get_embedder():
+    # Loaded once per process; same encoder vectorize_documents.py indexed with
+    return build_embeddings()
+
+
+@st.cache_resource
 def setup_vectorstore():
     persist_directory = f"{working_dir}/vector_db_dir"
-    embedddings = HuggingFaceEmbeddings()
     vectorstore = Chroma(persist_directory=persist_directory,
-                         embedding_function=embeddings)
+                         embedding_function=get_embedder())
     return vectorstore
 
 
@@ -34,8 +39,10 @@ def chat_chain(vectorstore):
         search_kwargs={"k": 5}  # Retrieve top 5 most relevant chunks
     )
     
-    memory = ConversationBufferMemory(
+    # Older turns are summarized once the history passes max_token_limit
+    memory = ConversationSummaryBufferMemory(
         llm=llm,
+        max_token_limit=1500,
         output_key="answer",
         memory_key="chat_history",
         return_messages=True